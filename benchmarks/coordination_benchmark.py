@@ -0,0 +1,30 @@
+"""Compares the maximum matching engines of CoordinationModel. Run from the
+repository root with `python -m benchmarks.coordination_benchmark`."""
+from time import perf_counter
+from random import seed, getstate, setstate, shuffle
+from resettlement import coordination_model, localities_instance
+seed(0)
+
+evaluations = ["igraph", "augmenting", "warm_start", "blocks"]
+
+data = []
+
+for num_localities in [1, 2, 5, 10, 20]:
+    instance = localities_instance(num_localities)
+    # A random matching filling every locality to its cap
+    matching = [l for l, cap in enumerate(instance.locality_caps)
+                for _ in range(cap)]
+    shuffle(matching)
+    # Every engine consumes the same random stream
+    state = getstate()
+    for evaluation in evaluations:
+        setstate(state)
+        model = coordination_model(instance, evaluation=evaluation)
+        start = perf_counter()
+        utility = model.utility_for_matching(matching, False)
+        datum = {"number of localities": num_localities,
+                 "evaluation": evaluation, "utility": utility,
+                 "seconds": perf_counter() - start}
+        data.append(datum)
+        print(f'localities = {num_localities}, evaluation = {evaluation}, '
+              f'utility = {utility:.3f}, time = {datum["seconds"]:.2f}s')
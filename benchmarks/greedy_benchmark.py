@@ -0,0 +1,63 @@
+"""Compares the modes of greedy_algorithm. Run from the repository root with
+`python -m benchmarks.greedy_benchmark`."""
+from time import perf_counter
+from random import seed, getstate, setstate
+from resettlement import greedy_algorithm, localities_instance, model_builders
+seed(0)
+
+num_localities = 10
+epsilons = [0.5, 0.1, 0.01]
+
+data = []
+
+def sample(setting, mode, epsilon=None):
+    m = model_builders[setting](localities_instance(num_localities))
+    stats = {}
+    start = perf_counter()
+    if mode == "stochastic":
+        utility = greedy_algorithm(m, mode, stats, epsilon)[1]
+    else:
+        utility = greedy_algorithm(m, mode, stats)[1]
+    datum = {}
+    datum["model"] = setting
+    datum["mode"] = mode if epsilon is None else f"{mode} ε={epsilon}"
+    datum["utility"] = utility
+    datum["seconds"] = perf_counter() - start
+    datum["oracle calls"] = stats["oracle_calls"]
+    data.append(datum)
+    return datum
+
+from datetime import datetime
+for repetition in range(2):
+    for setting in model_builders:
+        # Every mode runs on the same instance and the same random stream
+        state = getstate()
+        runs = [("standard", None), ("lazy", None)] + \
+               [("stochastic", epsilon) for epsilon in epsilons]
+        for mode, epsilon in runs:
+            setstate(state)
+            datum = sample(setting, mode, epsilon)
+            print(datetime.now(), setting, datum["mode"],
+                  f'utility = {datum["utility"]:.3f}',
+                  f'time = {datum["seconds"]:.2f}s',
+                  f'oracle calls = {datum["oracle calls"]}')
+        baseline = data[-len(runs)]
+        for datum in data[-len(runs):]:
+            datum["utility / greedy"] = datum["utility"] / baseline["utility"]
+            datum["time / greedy"] = datum["seconds"] / baseline["seconds"]
+
+def plot():
+    import matplotlib
+    matplotlib.use("Agg")
+    import seaborn
+    import pandas
+    seaborn.set(style="darkgrid")
+    matplotlib.rcParams["figure.dpi"] = 300
+    matplotlib.rcParams["font.family"] = "serif"
+    matplotlib.rcParams["font.serif"] = ["Times New Roman"]
+    d = pandas.DataFrame(data)
+    g = seaborn.relplot(x="time / greedy", y="utility / greedy", col="model",
+                        hue="mode", data=d)
+    g.savefig("greedy_modes.pdf")
+
+plot()
@@ -0,0 +1,13 @@
+"""Simulation code for migrant resettlement by evolutionary multi-objective
+optimization: the models, the greedy and GSEMO algorithms, random instances
+and the experiments of the paper."""
+from .models import (CoordinationModel, InterviewModel, MatchingEvaluator,
+                     Memoization, Model, RetroactiveCorrectionModel)
+from .methods import greedy_algorithm, gsemo_algorithm
+from .instances import (Instance, agents_instance, coordination_model,
+                        correction_model, interview_model, jobs_instance,
+                        localities_instance, model_builders,
+                        professions_instance)
+from .experiments import Sweep
+from .sweep import cell_seed, load_results, run_sweep
+from .rng import numpy_rng, python_rng, spawn_rngs
@@ -0,0 +1,53 @@
+"""Runs an experiment of the paper.
+
+Usage: python -m resettlement EXPERIMENT [simulate | plot] [--workers N]
+
+Without a command, the experiment's sweep is run and then plotted. Runs are
+recorded in EXPERIMENT.jsonl, so that an interrupted sweep resumes where it
+stopped, and the figure is saved to EXPERIMENT.pdf.
+"""
+from argparse import ArgumentParser
+from datetime import datetime
+import logging
+
+from .experiments import experiments, sample
+from .sweep import load_results, run_sweep
+
+
+def _report(cell, datum):
+    logging.getLogger(__name__).info(
+        f'{cell}, gsemo = {datum["gsemo"]}, greedy = {datum["greedy"]}, '
+        f'gsemo / greedy = {datum["gsemo / greedy"]}')
+    print(datetime.now(), *cell)
+
+
+def main():
+    parser = ArgumentParser(prog="python -m resettlement",
+                            description="Runs an experiment of the paper.")
+    parser.add_argument("experiment", choices=sorted(experiments))
+    parser.add_argument("command", nargs="?", choices=["simulate", "plot"])
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes, all cores if "
+                             "omitted")
+    args = parser.parse_args()
+    name = args.experiment
+    experiment = experiments[name]
+    results_path = f"{name}.jsonl"
+
+    if args.command != "plot":
+        logging.basicConfig(
+            filename=f"{name}.log", level=logging.INFO,
+            format="%(asctime)s - %(filename)s[line:%(lineno)d] - "
+                   "%(levelname)s: %(message)s")
+        cells = [(name,) + cell for cell in experiment.cells()]
+        run_sweep(sample, cells, repetitions=experiment.repetitions,
+                  max_workers=args.workers, callback=_report,
+                  results_path=results_path)
+    if args.command != "simulate":
+        from .plots import plot
+        data = [record["datum"] for record in load_results(results_path)]
+        plot(experiment, data, f"{name}.pdf")
+
+
+if __name__ == "__main__":
+    main()
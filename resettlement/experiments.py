@@ -0,0 +1,148 @@
+from collections import namedtuple
+from itertools import product
+
+from .instances import (agents_instance, jobs_instance, localities_instance,
+                        model_builders, professions_instance)
+from .methods import greedy_algorithm, gsemo_algorithm
+from .rng import spawn_rngs
+
+
+class Sweep(namedtuple("Sweep", ["axes", "values", "instance", "budget",
+                                 "repetitions", "plot", "settings",
+                                 "model_options", "greedy_mode"])):
+    """Declarative specification of an experiment.
+
+    Attributes:
+        axes (tuple of str): names of the swept parameters, as they appear in
+                             the recorded data
+        values (list of tuple): swept parameter values, one tuple per point
+        instance (function): builds an instances.Instance from the swept
+                             parameter values of a point and a generator
+                             passed as keyword argument rng
+        budget (function): number of GSEMO iterations for a given model
+        repetitions (int): number of runs of every point and setting
+        plot (str): name of the plot in plots, see plots.plot
+        settings (tuple of str): models in instances.model_builders that are
+                                 compared at every point
+        model_options (dict): maps settings to the keyword arguments passed
+                              to their model builders, e.g.
+                              ``{"coordination": {"evaluation":
+                              "warm_start"}}``; settings missing from it use
+                              the builders' defaults
+        greedy_mode (str): mode of methods.greedy_algorithm
+    """
+
+    def __new__(cls, axes, values, instance, budget, repetitions, plot,
+                settings, model_options=None, greedy_mode="standard"):
+        if model_options is None:
+            model_options = {}
+        assert set(model_options) <= set(settings)
+        return super().__new__(cls, axes, values, instance, budget,
+                               repetitions, plot, settings, model_options,
+                               greedy_mode)
+
+    def cells(self):
+        """Returns the cells (setting, *values) of the sweep."""
+        return [(setting,) + values
+                for values in self.values for setting in self.settings]
+
+
+_SETTINGS = ("correction", "interview", "coordination")
+
+
+def _single(values):
+    return [(value,) for value in values]
+
+
+# Experiments of the paper. Versions 2 only differ from versions 1 by a
+# smaller GSEMO budget.
+experiments = {
+    "agents": Sweep(
+        axes=("number of agents",), values=_single([50, 100, 150, 200]),
+        instance=agents_instance,
+        budget=lambda model: model.num_agents * 1000000,
+        repetitions=2, plot="catplot", settings=_SETTINGS),
+    "jobs": Sweep(
+        axes=("jobs in profession 1", "jobs in profession 2"),
+        values=list(product([25, 50, 75], repeat=2)),
+        instance=jobs_instance,
+        budget=lambda model: (model.num_agents * len(model.locality_caps)
+                              * 100000),
+        repetitions=2, plot="catplot", settings=_SETTINGS),
+    "jobs-v2": Sweep(
+        axes=("jobs in profession 1", "jobs in profession 2"),
+        values=list(product([25, 50, 75], repeat=2)),
+        instance=jobs_instance,
+        budget=lambda model: (model.num_agents * len(model.locality_caps)
+                              * 10000),
+        repetitions=2, plot="catplot", settings=_SETTINGS),
+    "localities": Sweep(
+        axes=("number of localities",), values=_single(range(1, 21)),
+        instance=localities_instance,
+        budget=lambda model: len(model.locality_caps) * 1000000,
+        repetitions=2, plot="outliers", settings=_SETTINGS),
+    "localities-v2": Sweep(
+        axes=("number of localities",), values=_single(range(1, 21)),
+        instance=localities_instance,
+        budget=lambda model: len(model.locality_caps) * 100000,
+        repetitions=2, plot="outliers", settings=_SETTINGS),
+    "professions": Sweep(
+        axes=("number of professions",),
+        values=_single([2, 3, 5, 8, 10, 15]),
+        instance=professions_instance,
+        budget=lambda model: (model.num_agents * len(model.locality_caps)
+                              * 100000),
+        repetitions=2, plot="catplot", settings=_SETTINGS),
+    "professions-v2": Sweep(
+        axes=("number of professions",),
+        values=_single([2, 3, 5, 8, 10, 15]),
+        instance=professions_instance,
+        budget=lambda model: (model.num_agents * len(model.locality_caps)
+                              * 10000),
+        repetitions=2, plot="catplot", settings=_SETTINGS),
+    "specialization": Sweep(
+        axes=("number of localities",), values=_single([10]),
+        instance=localities_instance,
+        budget=lambda model: model.num_agents * 200000,
+        repetitions=2, plot="catplot", settings=_SETTINGS),
+}
+
+
+def sample(name, setting, *values, seed=None):
+    """Runs greedy and GSEMO on a random instance of an experiment.
+
+    The instance, the model's random experiments, greedy and GSEMO draw from
+    independent streams spawned from `seed`, so that, e.g., a change of the
+    GSEMO budget leaves the instance and greedy's result unchanged.
+
+    Args:
+        name (str): experiment in experiments
+        setting (str): model in instances.model_builders
+        values: swept parameter values
+        seed (int / None): seed of the run; if None, everything draws from
+                           the global `random` module
+
+    Returns:
+        dict: the datum of the run
+    """
+    experiment = experiments[name]
+    if seed is None:
+        instance_rng = model_rng = greedy_rng = gsemo_rng = None
+    else:
+        instance_rng, model_rng, greedy_rng, gsemo_rng = spawn_rngs(seed, 4)
+    instance = experiment.instance(*values, rng=instance_rng)
+    m = model_builders[setting](instance, rng=model_rng,
+                                **experiment.model_options.get(setting, {}))
+    greedy = greedy_algorithm(m, experiment.greedy_mode, rng=greedy_rng)[1]
+    gsemo = gsemo_algorithm(m, budget=experiment.budget(m),
+                            rng=gsemo_rng)[1]
+    datum = dict(zip(experiment.axes, values))
+    datum["number of agents"] = m.num_agents
+    datum["greedy"] = greedy
+    datum["gsemo"] = gsemo
+    if greedy > 0.0005:
+        datum["gsemo / greedy"] = gsemo / greedy
+    else:
+        datum["gsemo / greedy"] = None
+    datum["model"] = setting
+    return datum
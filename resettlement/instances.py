@@ -0,0 +1,243 @@
+from collections import namedtuple
+from .models import (CoordinationModel, InterviewModel,
+                     RetroactiveCorrectionModel)
+from .rng import python_rng
+
+
+# professions[i] is the profession of agent i and job_numbers[l][p] is the
+# number of jobs for profession p at locality l
+Instance = namedtuple("Instance", ["num_agents", "num_professions",
+                                   "professions", "locality_caps",
+                                   "job_numbers"])
+
+
+def _distribute_jobs_within_caps(profession_counts, locality_caps, rng):
+    """Distributes as many jobs per profession as it has agents such that
+    each locality has as many jobs as its cap.
+
+    The jobs of each locality are drawn one by one without replacement from
+    the jobs that remain to be distributed.
+    """
+    profession_remaining = profession_counts[:]
+    jobs_remaining = sum(profession_counts)
+    job_numbers = []
+    for cap in locality_caps:
+        ps = [0 for _ in profession_counts]
+        for _ in range(cap):
+            a = rng.random()
+            for prof, remaining in enumerate(profession_remaining):
+                if a < remaining / jobs_remaining:
+                    ps[prof] += 1
+                    profession_remaining[prof] -= 1
+                    break
+                a -= remaining / jobs_remaining
+            jobs_remaining -= 1
+        job_numbers.append(tuple(ps))
+
+    assert sum(profession_remaining) == 0
+    return job_numbers
+
+
+def agents_instance(num_agents, num_localities=10, rng=None):
+    """Two professions of equal size and localities of equal cap.
+
+    Args:
+        num_agents (int): number of agents, a multiple of num_localities
+        num_localities (int): number of localities
+        rng (random.Random / numpy.random.Generator / None): generator of
+                the instance, the global `random` module if None
+
+    Returns:
+        Instance
+    """
+    rng = python_rng(rng)
+    assert num_agents % num_localities == 0
+    prof1 = num_agents // 2
+    prof2 = num_agents - prof1
+    professions = [0] * prof1 + [1] * prof2
+    locality_caps = [num_agents // num_localities] * num_localities
+    job_numbers = _distribute_jobs_within_caps([prof1, prof2], locality_caps,
+                                               rng)
+    return Instance(num_agents, 2, professions, locality_caps, job_numbers)
+
+
+def jobs_instance(prof1_jobs, prof2_jobs, num_agents=100, num_localities=10,
+                  rng=None):
+    """Two professions of equal size and localities of equal cap, whose jobs
+    are placed uniformly at random regardless of the caps.
+
+    Args:
+        prof1_jobs (int): number of jobs for profession 1
+        prof2_jobs (int): number of jobs for profession 2
+        num_agents (int): number of agents, a multiple of num_localities
+        num_localities (int): number of localities
+        rng (random.Random / numpy.random.Generator / None): generator of
+                the instance, the global `random` module if None
+
+    Returns:
+        Instance
+    """
+    rng = python_rng(rng)
+    assert num_agents % num_localities == 0
+    prof1 = num_agents // 2
+    prof2 = num_agents - prof1
+    professions = [0] * prof1 + [1] * prof2
+    locality_caps = [num_agents // num_localities] * num_localities
+    job_numbers = [(0, 0)] * num_localities
+    for _ in range(prof1_jobs):
+        l = rng.randrange(num_localities)
+        p1, p2 = job_numbers[l]
+        job_numbers[l] = (p1 + 1, p2)
+    for _ in range(prof2_jobs):
+        l = rng.randrange(num_localities)
+        p1, p2 = job_numbers[l]
+        job_numbers[l] = (p1, p2 + 1)
+    return Instance(num_agents, 2, professions, locality_caps, job_numbers)
+
+
+def localities_instance(num_localities, num_agents=100, rng=None):
+    """Two professions of equal size and random caps adding up to the number
+    of agents, each locality having at least one space.
+
+    Args:
+        num_localities (int): number of localities, at most num_agents
+        num_agents (int): number of agents
+        rng (random.Random / numpy.random.Generator / None): generator of
+                the instance, the global `random` module if None
+
+    Returns:
+        Instance
+    """
+    rng = python_rng(rng)
+    assert num_localities <= num_agents
+    prof1 = num_agents // 2
+    prof2 = num_agents - prof1
+    professions = [0] * prof1 + [1] * prof2
+    locality_caps = [1 for _ in range(num_localities)]
+    for _ in range(num_agents - num_localities):
+        locality_caps[rng.randrange(len(locality_caps))] += 1
+    job_numbers = _distribute_jobs_within_caps([prof1, prof2], locality_caps,
+                                               rng)
+    return Instance(num_agents, 2, professions, locality_caps, job_numbers)
+
+
+def professions_instance(num_professions, num_agents=100, num_localities=10,
+                         rng=None):
+    """Agents with uniformly random professions, each profession having at
+    least one agent, and localities of equal cap.
+
+    Args:
+        num_professions (int): number of professions, at most num_agents
+        num_agents (int): number of agents, a multiple of num_localities
+        num_localities (int): number of localities
+        rng (random.Random / numpy.random.Generator / None): generator of
+                the instance, the global `random` module if None
+
+    Returns:
+        Instance
+    """
+    rng = python_rng(rng)
+    assert num_professions <= num_agents
+    assert num_agents % num_localities == 0
+    professions = list(range(num_professions))
+    profession_counts = [1 for _ in range(num_professions)]
+    for _ in range(num_agents - num_professions):
+        prof = rng.randrange(num_professions)
+        professions.append(prof)
+        profession_counts[prof] += 1
+    locality_caps = [num_agents // num_localities] * num_localities
+    job_numbers = _distribute_jobs_within_caps(profession_counts,
+                                               locality_caps, rng)
+    return Instance(num_agents, num_professions, professions, locality_caps,
+                    job_numbers)
+
+
+def correction_model(instance, random_samples=1000, rng=None, **kwargs):
+    """Builds the retroactive correction model of an instance, in which every
+    agent has a random qualification probability, the same at all localities,
+    and a locality employs at most as many agents of a profession as it has
+    jobs for it.
+
+    The model is drawn from and, like its random experiments, draws from
+    rng, the global `random` module if None. Additional keyword arguments
+    are passed to the model.
+    """
+    rng = python_rng(rng)
+    num_localities = len(instance.locality_caps)
+    qualification_probabilities = \
+        [[rng.random()] * num_localities for _ in range(instance.num_agents)]
+    correction_functions = []
+    for ps in instance.job_numbers:
+        # The default parameters in the lambdas are never used, but are
+        # a way of getting Python's peculiar binding behavior to work.
+        # See https://docs.python.org/3/faq/programming.html#why-do-
+        # lambdas-defined-in-a-loop-with-different-values-all-return-
+        # the-same-result for more information.
+        correction_functions.append(
+            [(lambda x, P=p: min(x, P)) for p in ps])
+    return RetroactiveCorrectionModel(instance.num_agents,
+                                      instance.locality_caps,
+                                      instance.num_professions,
+                                      instance.professions,
+                                      qualification_probabilities,
+                                      correction_functions, random_samples,
+                                      rng=rng, **kwargs)
+
+
+def interview_model(instance, random_samples=1000, rng=None, **kwargs):
+    """Builds the interview model of an instance, in which every agent has a
+    random compatibility probability with all jobs of her profession.
+
+    The model is drawn from and, like its random experiments, draws from
+    rng, the global `random` module if None. Additional keyword arguments
+    are passed to the model.
+    """
+    rng = python_rng(rng)
+    compatibility_probabilities = [rng.random()
+                                   for _ in range(instance.num_agents)]
+    return InterviewModel(instance.num_agents, instance.locality_caps,
+                          instance.num_professions, instance.professions,
+                          instance.job_numbers, compatibility_probabilities,
+                          random_samples, rng=rng, **kwargs)
+
+
+def coordination_model(instance, random_samples=1000, rng=None, **kwargs):
+    """Builds the coordination model of an instance, in which every agent has
+    a random competency, her compatibility probability with all jobs of her
+    profession, and is incompatible with all other jobs.
+
+    Jobs at locality l are numbered profession by profession. The
+    compatibilities are built directly in sparse form.
+
+    The model is drawn from and, like its random experiments, draws from
+    rng, the global `random` module if None. Additional keyword arguments
+    are passed to the model.
+    """
+    rng = python_rng(rng)
+    locality_num_jobs = [sum(ps) for ps in instance.job_numbers]
+    # first_jobs[l][p] is the first job of profession p at locality l
+    first_jobs = []
+    for ps in instance.job_numbers:
+        firsts = [0]
+        for p in ps[:-1]:
+            firsts.append(firsts[-1] + p)
+        first_jobs.append(firsts)
+    sparse_compatibilities = [{} for _ in instance.locality_caps]
+    for i, prof in enumerate(instance.professions):
+        competency = rng.random()
+        for l, ps in enumerate(instance.job_numbers):
+            if ps[prof] == 0:
+                continue
+            jobs = tuple(range(first_jobs[l][prof],
+                               first_jobs[l][prof] + ps[prof]))
+            sparse_compatibilities[l][i] = (jobs,
+                                            (competency,) * len(jobs))
+    return CoordinationModel(instance.num_agents, instance.locality_caps,
+                             locality_num_jobs, None, random_samples,
+                             sparse_compatibilities=sparse_compatibilities,
+                             rng=rng, **kwargs)
+
+
+model_builders = {"correction": correction_model,
+                  "interview": interview_model,
+                  "coordination": coordination_model}
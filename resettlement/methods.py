@@ -0,0 +1,501 @@
+from math import ceil, inf, log, exp, sqrt
+from functools import reduce
+from heapq import heapify, heappop, heappush
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import logging
+
+import numpy as np
+
+from .rng import numpy_rng, python_rng
+# from gurobipy import Model as GurobiModel, GRB, quicksum
+
+def _mutate(element, p, rng):
+    """Returns a copy of the genome ``element`` in which each bit is flipped
+    independently with probability p, and the flipped bits.
+
+    Rather than drawing a uniform number per bit, the gaps between flipped
+    bits are drawn from a geometric distribution, which yields the same
+    distribution in O(number of flips) time.
+
+    Returns:
+        pair (offspring, flips), where flips is a list of triples
+        (agent, locality, +1 if the bit was set / -1 if it was cleared)
+    """
+    offspring = element.copy()
+    bits = offspring.reshape(-1)
+    num_localities = element.shape[1]
+    flips = []
+    position = int(rng.geometric(p)) - 1
+    while position < bits.size:
+        bits[position] ^= 1
+        i, l = divmod(position, num_localities)
+        flips.append((i, l, 1 if bits[position] else -1))
+        position += int(rng.geometric(p))
+    return offspring, flips
+
+
+def _genome_state(element, locality_caps):
+    """Computes the bookkeeping of a genome from scratch.
+
+    Args:
+        element (numpy.ndarray): num_agents × num_localities uint8 matrix
+                                 with a 1 at (i, l) if agent i is placed in
+                                 locality l
+        locality_caps (list of int): the maximum capacity of each locality
+
+    Returns:
+        tuple (agent_counts, locality_usage, violations, f2_value,
+        locality_per_agent). ``agent_counts`` and ``locality_usage`` are the
+        row and column sums, ``violations`` the number of agents in more
+        than one locality plus the number of localities over their cap (the
+        genome is feasible iff it is 0), ``f2_value`` the number of 0 bits and
+        ``locality_per_agent`` the locality of each agent with at most one
+        locality (None if she has none).
+    """
+    agent_counts = element.sum(axis=1).tolist()
+    locality_usage = element.sum(axis=0).tolist()
+    violations = (sum(1 for count in agent_counts if count > 1)
+                  + sum(1 for usage, cap in zip(locality_usage, locality_caps)
+                        if usage > cap))
+    f2_value = element.size - sum(agent_counts)
+    locality_per_agent = [l if count else None for l, count in zip(
+                              element.argmax(axis=1).tolist(), agent_counts)]
+    return (agent_counts, locality_usage, violations, f2_value,
+            locality_per_agent)
+
+
+def _flip_deltas(parent, flips, locality_caps):
+    """Derives f2 and the feasibility of an offspring from the parent's
+    bookkeeping and the flipped bits in O(number of flips).
+
+    Returns:
+        tuple (f2_value, violations, agent_deltas, locality_deltas), the
+        deltas mapping each touched agent / locality to the change of its
+        row / column sum
+    """
+    agent_deltas = {}
+    locality_deltas = {}
+    f2_value = parent.f2_value
+    for i, l, delta in flips:
+        agent_deltas[i] = agent_deltas.get(i, 0) + delta
+        locality_deltas[l] = locality_deltas.get(l, 0) + delta
+        f2_value -= delta
+    violations = parent.violations
+    for i, delta in agent_deltas.items():
+        count = parent.agent_counts[i]
+        violations += (count + delta > 1) - (count > 1)
+    for l, delta in locality_deltas.items():
+        usage, cap = parent.locality_usage[l], locality_caps[l]
+        violations += (usage + delta > cap) - (usage > cap)
+    return f2_value, violations, agent_deltas, locality_deltas
+
+
+def _offspring_state(parent, offspring, agent_deltas, locality_deltas):
+    """Applies the deltas of ``_flip_deltas`` to copies of the parent's
+    bookkeeping.
+
+    Returns:
+        triple (agent_counts, locality_usage, locality_per_agent) of the
+        offspring genome ``offspring``
+    """
+    agent_counts = list(parent.agent_counts)
+    locality_usage = list(parent.locality_usage)
+    locality_per_agent = list(parent.locality_per_agent)
+    for i, delta in agent_deltas.items():
+        agent_counts[i] += delta
+        if agent_counts[i] == 0:
+            locality_per_agent[i] = None
+        elif agent_counts[i] == 1:
+            locality_per_agent[i] = int(offspring[i].argmax())
+    for l, delta in locality_deltas.items():
+        locality_usage[l] += delta
+    return agent_counts, locality_usage, locality_per_agent
+
+
+def _offspring_evaluator(model, parent_evaluator, locality_per_agent,
+                         touched_agents):
+    """Returns a models.MatchingEvaluator for the feasible matching
+    ``locality_per_agent``, derived from the parent's evaluator (if the parent
+    was feasible) by only re-evaluating the cells of agents that moved, which
+    can only be among ``touched_agents``."""
+    if parent_evaluator is None:
+        return model.evaluator(locality_per_agent)
+    parent_localities = parent_evaluator.locality_per_agent
+    moved = [i for i in touched_agents
+             if parent_localities[i] != locality_per_agent[i]]
+    if not moved:
+        return parent_evaluator
+    evaluator = parent_evaluator.copy()
+    # Unmatch first so that no locality temporarily exceeds its cap
+    for i in moved:
+        if evaluator.locality_per_agent[i] is not None:
+            evaluator.remove(i)
+    for i in moved:
+        if locality_per_agent[i] is not None:
+            evaluator.add(i, locality_per_agent[i])
+    return evaluator
+
+
+class _LRUCache(object):
+    """Mapping with at most ``maxsize`` entries that evicts the least recently
+    used entry and counts hits and misses of ``get``."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Returns the value stored for ``key``, or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class _ParetoArchive(object):
+    """Archive of mutually non-dominated elements for the two objectives
+    (f1_value, f2_value), both maximized, with integer f2 values.
+
+    No two elements share an f2 value, so the elements are kept sorted by
+    ascending f2 value, which means descending f1 value. Dominance checks
+    are then a binary search and insertion only removes a contiguous run of
+    elements.
+    """
+
+    def __init__(self):
+        self._f2_values = []
+        self._elements = []
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __getitem__(self, index):
+        return self._elements[index]
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def is_dominated(self, f1_value, f2_value):
+        """Whether some archived element is at least as good in both
+        objectives and strictly better in one."""
+        # The element with the smallest f2 value >= f2_value has the largest
+        # f1 value among all elements that are at least as good in f2
+        index = bisect_left(self._f2_values, f2_value)
+        if index == len(self._elements):
+            return False
+        e = self._elements[index]
+        return (e.f1_value > f1_value) or (e.f1_value >= f1_value
+                                           and e.f2_value > f2_value)
+
+    def insert(self, elem):
+        """Inserts a non-dominated element and removes all elements that are
+        weakly dominated by it."""
+        end = bisect_right(self._f2_values, elem.f2_value)
+        start = end
+        while (start > 0
+               and self._elements[start - 1].f1_value <= elem.f1_value):
+            start -= 1
+        self._f2_values[start:end] = [elem.f2_value]
+        self._elements[start:end] = [elem]
+
+
+def gsemo_algorithm(model, cache_size=4096, stats=None, budget=None,
+                    log_interval=None, rng=None):
+    """The GSEMO algorithm for maximizing an (approximately) submodular
+    utility function.
+
+    Args:
+        model (models.Model): The submodular model to use
+        cache_size (int): number of evaluated matchings whose fitness is kept
+                          in an LRU cache, so that offspring decoding to one
+                          of them are not evaluated again; 0 disables it
+        stats (dict or None): if given, "cache_hits" and "cache_misses" are
+                              set to the fitness cache statistics of the run
+        budget (int or None): number of iterations, num_agents * 200000 if
+                              None
+        log_interval (int or None): if given, the archive is logged every
+                                    log_interval iterations
+        rng (random.Random or numpy.random.Generator or None): generator of
+                the mutations and parent selections, the global `random`
+                module if None
+
+    Returns:
+        pair (best_res,best_value) of type (list of int/None, float).
+        The first component is the matching, the second its queried value in
+        the model.
+    """
+    # in element we use a num_agents × num_localities uint8 matrix to show all
+    # possible agent-locality pairs
+    class ArchivedElem(object):
+        def __init__(self, f1_value, f2_value, element, locality_per_agent,
+                     evaluator, agent_counts, locality_usage, violations):
+            super(ArchivedElem, self).__init__()
+            self.f1_value = f1_value
+            self.f2_value = f2_value
+            self.element = element
+            self.locality_per_agent = locality_per_agent
+            # models.MatchingEvaluator of a feasible element, None otherwise
+            self.evaluator = evaluator
+            # bookkeeping to check offspring feasibility from flipped bits,
+            # see _genome_state
+            self.agent_counts = agent_counts
+            self.locality_usage = locality_usage
+            self.violations = violations
+
+    # Mutations draw from a NumPy generator, parent selection from `choice`
+    choice = python_rng(rng).choice
+    rng = numpy_rng(rng)
+    p = 1.0 / (model.num_agents * len(model.locality_caps))
+    init_elem, _ = _mutate(np.zeros((model.num_agents,
+                                     len(model.locality_caps)),
+                                    dtype=np.uint8), p, rng)
+
+    (init_agent_counts, init_locality_usage, init_violations, f2_init,
+     init_locality_per_agent) = _genome_state(init_elem, model.locality_caps)
+    f1_init = -1
+    init_evaluator = None
+    # maps a decoded matching (as tuple) to its models.MatchingEvaluator
+    fitness_cache = _LRUCache(cache_size)
+    if init_violations == 0:
+        init_evaluator = model.evaluator(init_locality_per_agent)
+        fitness_cache.put(tuple(init_locality_per_agent), init_evaluator)
+        f1_init = init_evaluator.utility
+    archived_set = _ParetoArchive()
+    archived_set.insert(ArchivedElem(f1_init, f2_init, init_elem,
+                                     init_locality_per_agent, init_evaluator,
+                                     init_agent_counts, init_locality_usage,
+                                     init_violations))
+
+    logger = logging.getLogger(__name__)
+
+    T = model.num_agents * 200000 if budget is None else budget
+    for it in range(T):
+        selected = choice(archived_set)
+        selected_elem, flips = _mutate(selected.element, p, rng)
+
+        # Infeasible offspring are recognized from the flipped bits alone
+        f2_selected, violations, agent_deltas, locality_deltas = \
+            _flip_deltas(selected, flips, model.locality_caps)
+        f1_selected = -1
+        evaluator = None
+        state = None
+        if violations == 0:
+            state = _offspring_state(selected, selected_elem, agent_deltas,
+                                     locality_deltas)
+            key = tuple(state[2])
+            evaluator = fitness_cache.get(key)
+            if evaluator is None:
+                evaluator = _offspring_evaluator(model, selected.evaluator,
+                                                 state[2], agent_deltas)
+                fitness_cache.put(key, evaluator)
+            f1_selected = evaluator.utility
+
+        if not archived_set.is_dominated(f1_selected, f2_selected):
+            if state is None:
+                state = _offspring_state(selected, selected_elem,
+                                         agent_deltas, locality_deltas)
+            agent_counts, locality_usage, locality_per_agent = state
+            archived_set.insert(ArchivedElem(f1_selected, f2_selected,
+                                             selected_elem,
+                                             locality_per_agent, evaluator,
+                                             agent_counts, locality_usage,
+                                             violations))
+
+        if log_interval is not None and it % log_interval == 0:
+            lena = len(archived_set)
+            fvalue = -1
+            loc = [None for _ in range(model.num_agents)]
+            lenlist = []
+            f1list = []
+            f2list = []
+            # logger.info(f'----------------------')
+            for elem in archived_set:
+                sum0 = elem.element.size - int(elem.element.sum())
+                # logger.info(f'{elem.element}')
+                lenlist.append(sum0)
+                f1list.append(elem.f1_value)
+                f2list.append(elem.f2_value)
+                if fvalue < elem.f1_value:
+                    fvalue = elem.f1_value
+                    loc = elem.locality_per_agent
+            # logger.info(f'----------------------')
+            logger.info(f'f1list = {f1list}, f2list = {f2list}, lenlist = {lenlist}, max f1 value = {fvalue}, max locality_per_agent = {loc}, locality_caps = {model.locality_caps}, archived_set_size = {lena}, selected_elem = {selected_elem.tolist()}')
+
+    best_value = -1
+    best_res = [None for _ in range(model.num_agents)]
+    for e in archived_set:
+        if e.f1_value > best_value:
+            best_value, best_res = e.f1_value, e.locality_per_agent
+
+    if stats is not None:
+        stats["cache_hits"] = fitness_cache.hits
+        stats["cache_misses"] = fitness_cache.misses
+    return best_res, model.utility_for_matching(best_res,False)
+
+
+def _standard_greedy_choice(evaluator, caps_remaining):
+    """Evaluates every unmatched agent in every locality with free space.
+
+    Returns:
+        pair (best_pair, oracle_calls)
+    """
+    best_pair = None
+    best_value = -inf
+    oracle_calls = 0
+    for i, match in enumerate(evaluator.locality_per_agent):
+        if match != None:
+            continue
+
+        for l, spaces in enumerate(caps_remaining):
+            if spaces <= 0:
+                continue
+
+            utility = evaluator.utility_if_moved(i, l)
+            oracle_calls += 1
+
+            if utility > best_value:
+                best_pair = (i, l)
+                best_value = utility
+    return best_pair, oracle_calls
+
+
+def _lazy_greedy_choice(evaluator, caps_remaining, heap, round_):
+    """Pops stale upper bounds on marginal gains from ``heap`` until the top
+    pair has been evaluated in the current round ``round_``.
+
+    By submodularity, marginal gains only shrink as the matching grows, so a
+    gain evaluated in an earlier round is an upper bound on the current one.
+    Heap entries are (-gain bound, agent, locality, round of evaluation);
+    pairs whose agent is matched or whose locality is full are dropped for
+    good.
+
+    Returns:
+        pair (best_pair, oracle_calls)
+    """
+    oracle_calls = 0
+    while heap:
+        negative_bound, i, l, evaluated_in = heappop(heap)
+        if (evaluator.locality_per_agent[i] is not None
+                or caps_remaining[l] <= 0):
+            continue
+        if evaluated_in == round_:
+            return (i, l), oracle_calls
+        gain = evaluator.utility_if_moved(i, l) - evaluator.utility
+        oracle_calls += 1
+        heappush(heap, (-gain, i, l, round_))
+    return None, oracle_calls
+
+
+def _stochastic_greedy_choice(evaluator, caps_remaining, sample_size, rng):
+    """Evaluates a uniformly random subset of ``sample_size`` pairs of an
+    unmatched agent and a locality with free space.
+
+    Returns:
+        pair (best_pair, oracle_calls)
+    """
+    candidates = [(i, l)
+                  for i, match in enumerate(evaluator.locality_per_agent)
+                  if match is None
+                  for l, spaces in enumerate(caps_remaining) if spaces > 0]
+    if len(candidates) > sample_size:
+        candidates = rng.sample(candidates, sample_size)
+
+    best_pair = None
+    best_value = -inf
+    for i, l in candidates:
+        utility = evaluator.utility_if_moved(i, l)
+        if utility > best_value:
+            best_pair = (i, l)
+            best_value = utility
+    return best_pair, len(candidates)
+
+
+def greedy_algorithm(model, mode="standard", stats=None, epsilon=0.1,
+                     rng=None):
+    """The greedy algorithm for maximizing an (approximately) submodular
+    utility function.
+
+    Args:
+        model (models.Model): The submodular model to use
+        mode (str): "standard" evaluates every unmatched agent in every
+                    locality with free space in each round. "lazy" keeps
+                    marginal gains from earlier rounds as upper bounds in a
+                    priority queue and only re-evaluates the top pair
+                    (Minoux's accelerated greedy); for submodular utilities it
+                    picks the same pairs with far fewer evaluations.
+                    "stochastic" only evaluates (N·L/k)·log(1/epsilon) random
+                    pairs per round, where k is the number of rounds
+                    (stochastic greedy; (1-1/e-epsilon)-approximate in
+                    expectation for submodular utilities).
+        stats (dict or None): if given, "oracle_calls" is set to the number
+                              of utility evaluations and
+                              "oracle_calls_saved" to how many fewer these
+                              are than in the standard mode
+        epsilon (float): accuracy parameter of the stochastic mode, in (0, 1)
+        rng (random.Random or numpy.random.Generator or None): generator of
+                the pairs sampled by the stochastic mode, the global `random`
+                module if None
+
+    Returns:
+        pair (locality_per_agent,best_value) of type (list of int/None, float).
+        The first component is the matching, the second its queried value in
+        the model.
+    """
+    assert mode in ("standard", "lazy", "stochastic")
+    rng = python_rng(rng)
+    evaluator = model.evaluator()
+    locality_per_agent = evaluator.locality_per_agent
+    caps_remaining = [cap for cap in model.locality_caps]
+
+    if mode == "lazy":
+        # Infinite upper bounds make the first round evaluate every pair
+        heap = [(-inf, i, l, None) for i in range(model.num_agents)
+                for l, spaces in enumerate(caps_remaining) if spaces > 0]
+        heapify(heap)
+
+    num_rounds = min(model.num_agents, sum(caps_remaining))
+    if mode == "stochastic":
+        assert 0 < epsilon < 1
+        sample_size = ceil(model.num_agents * len(model.locality_caps)
+                           / max(num_rounds, 1) * log(1 / epsilon))
+
+    oracle_calls = standard_oracle_calls = 0
+    for round_ in range(num_rounds):
+        standard_oracle_calls += (
+            locality_per_agent.count(None)
+            * sum(1 for spaces in caps_remaining if spaces > 0))
+        if mode == "lazy":
+            best_pair, calls = _lazy_greedy_choice(evaluator, caps_remaining,
+                                                   heap, round_)
+        elif mode == "stochastic":
+            best_pair, calls = _stochastic_greedy_choice(
+                                   evaluator, caps_remaining, sample_size, rng)
+        else:
+            best_pair, calls = _standard_greedy_choice(evaluator,
+                                                       caps_remaining)
+        oracle_calls += calls
+
+        assert best_pair != None
+        i, l = best_pair
+        evaluator.add(i, l)
+        caps_remaining[l] -= 1
+
+    if stats is not None:
+        stats["oracle_calls"] = oracle_calls
+        stats["oracle_calls_saved"] = standard_oracle_calls - oracle_calls
+    return locality_per_agent, model.utility_for_matching(locality_per_agent,
+                                                          False)
@@ -0,0 +1,1399 @@
+from collections import OrderedDict
+from math import sqrt
+from sys import getsizeof
+
+from igraph import Graph
+import numpy as np
+
+from .rng import numpy_rng, python_rng
+
+
+class Model:
+    """A (submodular) model for the utility of matchings.
+
+    Attributes:
+        num_agents (int): number of simulated agents, named i = 0, …,
+                          num_agents-1
+        locality_caps (list of int): for each locality l = 0, …,
+                                     len(locality_caps), its maximum capacity
+    """
+
+    def check_valid_matching(self, matching):
+        """Raises an appropriate exception if argument is no valid matching.
+
+        Dimensions might be wrong, indices out of bound or matching constraints
+        violated.
+
+        Args:
+            matching (list of (int / None)): for each agent, her locality or
+                                             None if she remains unmatched
+        Raises:
+            ValueError: ``matching`` was no real matching
+        """
+        if len(matching) != self.num_agents:
+            raise ValueError(f"Argument matching has {len(matching)} values, "
+                             f"but there are {self.num_agents} agents.")
+        if not all((l is None) or (0 <= l < len(self.locality_caps))
+                   for l in matching):
+            raise ValueError("Some element of argument matching is not a "
+                             "valid locality index.")
+        locality_usage = [0 for _ in self.locality_caps]
+        for l in matching:
+            if l is not None:
+                locality_usage[l] += 1
+        for l, cap in enumerate(self.locality_caps):
+            if locality_usage[l] > cap:
+                raise ValueError(f"Matching places {locality_usage[l]} agents "
+                                 f"in locality {l}, but cap is {cap}.")
+
+    def utility_for_matching(self, matching, memoize=True):
+        """Computes the utility of a matching.
+
+        Args:
+            matching (list of (int / None)): for each agent, her locality or
+                                             None if she remains unmatched
+            memoize (bool): whether the model allowed to use memoized partial
+                            utilities for the utility
+        Returns:
+            a nonnegative float
+        Raises:
+            ValueError: ``matching`` was no real matching
+        """
+        raise NotImplementedError
+
+    def evaluator(self, matching=None, memoize=True):
+        """Creates a stateful evaluator for single-agent changes of a matching.
+
+        Args:
+            matching (list of (int / None)): initial matching, for each agent
+                                             her locality or None; defaults
+                                             to the empty matching
+            memoize (bool): whether the model allowed to use memoized partial
+                            utilities for the utility
+        Returns:
+            a ``MatchingEvaluator``
+        Raises:
+            ValueError: ``matching`` was no real matching
+        """
+        return MatchingEvaluator(self, matching, memoize)
+
+    def utility_and_error_for_matching(self, matching, memoize=True):
+        """Computes the utility of a matching and the standard error of its
+        estimate, for models sampling adaptively (see ``tolerance``).
+
+        The cells are estimated from independent random experiments, so the
+        squared standard errors of their utilities add up.
+
+        Args:
+            matching (list of (int / None)): for each agent, her locality or
+                                             None if she remains unmatched
+            memoize (bool): whether the model allowed to use memoized partial
+                            utilities for the utility
+        Returns:
+            a pair (utility, standard error) of nonnegative floats
+        Raises:
+            ValueError: ``matching`` was no real matching, or the model does
+                        not sample adaptively
+        """
+        if self.tolerance is None:
+            raise ValueError("The model does not sample adaptively; pass a "
+                             "tolerance to estimate standard errors.")
+        self.check_valid_matching(matching)
+        agents_per_cell = {cell: [] for cell in self._cells()}
+        for i, l in enumerate(matching):
+            if l is not None:
+                agents_per_cell[self._cell(i, l)].append(i)
+
+        utility = 0
+        variance = 0
+        for cell, agents in agents_per_cell.items():
+            cell_utility, standard_error = self._estimate_at_cell(
+                                               cell, agents, memoize)
+            utility += cell_utility
+            variance += standard_error ** 2
+        return utility, sqrt(variance)
+
+    def memoization_statistics(self):
+        """Returns, for each locality, a dict with the numbers of "hits",
+        "misses" and "evictions" of memoized partial utilities and the
+        number of "entries" currently memoized."""
+        memoization = self._memoization
+        entries = [0 for _ in self.locality_caps]
+        for l, _ in memoization.keys():
+            entries[l] += 1
+        return [{"hits": memoization.hits[l],
+                 "misses": memoization.misses[l],
+                 "evictions": memoization.evictions[l],
+                 "entries": entries[l]}
+                for l in range(len(self.locality_caps))]
+
+    def _cells(self):
+        """Iterates over the keys of all cells whose utilities add up to the
+        utility of a matching."""
+        raise NotImplementedError
+
+    def _cell(self, i, l):
+        """Returns the key of the cell agent i contributes to in locality l."""
+        raise NotImplementedError
+
+    def _utility_at_cell(self, cell, agents, memoize):
+        """Returns the utility of cell ``cell`` containing ``agents``."""
+        raise NotImplementedError
+
+    def _estimate_at_cell(self, cell, agents, memoize):
+        """Returns the pair (utility, standard error) of cell ``cell``
+        containing ``agents``, for models sampling adaptively."""
+        raise NotImplementedError
+
+    def _adaptive_estimate(self, l, key, sample, memoize):
+        """Estimates a cell's utility from batches of ``random_samples``
+        random experiments until the standard error of the estimate is at
+        most ``tolerance`` or ``max_samples`` experiments are run.
+
+        At least two batches are run. While all experiments so far had the
+        same utility, their variance is floored as if one more experiment
+        had deviated by 1 (the utilities count agents), so that a cell of
+        agents with probabilities near 0 or 1 does not report a standard
+        error of 0.
+
+        Args:
+            l (int): locality of the cell
+            key: memoization key of the cell at l
+            sample (int → numpy.ndarray): runs the given number of random
+                                          experiments and returns their
+                                          utilities
+            memoize (bool): whether to use and store the memoized pair
+        Returns:
+            the pair (utility, standard error)
+        """
+        if memoize:
+            estimate = self._memoization.get(l, key)
+            if estimate is not None:
+                return estimate
+
+        # Running mean and sum of squared deviations, merged batch by batch
+        # (Chan et al.)
+        count = 0
+        mean = 0.
+        squared_deviations = 0.
+        while True:
+            utilities = sample(self.random_samples)
+            batch_mean = utilities.mean()
+            delta = batch_mean - mean
+            total = count + len(utilities)
+            squared_deviations += (((utilities - batch_mean) ** 2).sum()
+                                   + delta ** 2 * count * len(utilities)
+                                   / total)
+            mean += delta * len(utilities) / total
+            count = total
+            if squared_deviations > 0:
+                variance = squared_deviations / (count - 1)
+            else:
+                # Pseudo-count: count equal utilities and one at distance 1
+                variance = 1 / (count + 1)
+            standard_error = sqrt(variance / count)
+            if count >= self.max_samples or (
+                    count >= 2 * self.random_samples
+                    and standard_error <= self.tolerance):
+                break
+        estimate = (float(mean), standard_error)
+        self._memoization.put(l, key, estimate)
+        return estimate
+
+
+class MatchingEvaluator:
+    """Keeps track of a matching and the utilities of its cells, such that
+    adding, removing or moving a single agent only recomputes the (at most
+    two) cells this agent leaves or joins.
+
+    Attributes:
+        model (Model): the model the utilities are computed in
+        locality_per_agent (list of (int / None)): the current matching
+        locality_usage (list of int): number of agents in each locality
+        utility (float): utility of the current matching
+    """
+
+    def __init__(self, model, matching=None, memoize=True):
+        self.model = model
+        self.memoize = memoize
+        if matching is None:
+            matching = [None for _ in range(model.num_agents)]
+        model.check_valid_matching(matching)
+        self.locality_per_agent = list(matching)
+        self.locality_usage = [0 for _ in model.locality_caps]
+
+        agents_per_cell = {cell: [] for cell in model._cells()}
+        for i, l in enumerate(matching):
+            if l is not None:
+                self.locality_usage[l] += 1
+                agents_per_cell[model._cell(i, l)].append(i)
+        self._agents = {cell: frozenset(agents)
+                        for cell, agents in agents_per_cell.items()}
+        self._utilities = {cell: model._utility_at_cell(cell, agents, memoize)
+                           for cell, agents in self._agents.items()}
+        self.utility = sum(self._utilities.values())
+
+    def copy(self):
+        """Returns an independent evaluator for the same matching.
+
+        Cell agent sets are immutable and therefore shared, so copying costs
+        O(number of agents + number of cells) without any utility evaluation.
+        """
+        other = MatchingEvaluator.__new__(MatchingEvaluator)
+        other.model = self.model
+        other.memoize = self.memoize
+        other.locality_per_agent = list(self.locality_per_agent)
+        other.locality_usage = list(self.locality_usage)
+        other._agents = dict(self._agents)
+        other._utilities = dict(self._utilities)
+        other.utility = self.utility
+        return other
+
+    def _changed_cells(self, i, l):
+        """Returns the new (agents, utility) of each cell touched by moving
+        agent i to locality l (or None), without changing the state."""
+        old_l = self.locality_per_agent[i]
+        if old_l == l:
+            return {}
+        if l is not None:
+            if not 0 <= l < len(self.model.locality_caps):
+                raise ValueError(f"{l} is not a valid locality index.")
+            if self.locality_usage[l] >= self.model.locality_caps[l]:
+                raise ValueError(f"Locality {l} is already filled to its cap "
+                                 f"{self.model.locality_caps[l]}.")
+        changed = {}
+        if old_l is not None:
+            cell = self.model._cell(i, old_l)
+            changed[cell] = self._agents[cell] - {i}
+        if l is not None:
+            cell = self.model._cell(i, l)
+            changed[cell] = changed.get(cell, self._agents[cell]) | {i}
+        return {cell: (agents, self.model._utility_at_cell(cell, agents,
+                                                           self.memoize))
+                for cell, agents in changed.items()}
+
+    def utility_if_moved(self, i, l):
+        """Returns the utility the matching would have if agent i moved to
+        locality l (None meaning unmatched), leaving the state unchanged.
+
+        Raises:
+            ValueError: locality l is invalid or already filled to its cap
+        """
+        utility = self.utility
+        for cell, (_, cell_utility) in self._changed_cells(i, l).items():
+            utility += cell_utility - self._utilities[cell]
+        return utility
+
+    def move(self, i, l):
+        """Moves agent i to locality l (None meaning unmatched).
+
+        Returns:
+            the utility of the updated matching
+        Raises:
+            ValueError: locality l is invalid or already filled to its cap
+        """
+        for cell, (agents, cell_utility) in self._changed_cells(i, l).items():
+            self.utility += cell_utility - self._utilities[cell]
+            self._agents[cell] = agents
+            self._utilities[cell] = cell_utility
+        old_l = self.locality_per_agent[i]
+        if old_l is not None:
+            self.locality_usage[old_l] -= 1
+        if l is not None:
+            self.locality_usage[l] += 1
+        self.locality_per_agent[i] = l
+        return self.utility
+
+    def add(self, i, l):
+        """Matches the unmatched agent i to locality l.
+
+        Returns:
+            the utility of the updated matching
+        Raises:
+            ValueError: agent i is already matched, or locality l is invalid
+                        or already filled to its cap
+        """
+        if self.locality_per_agent[i] is not None:
+            raise ValueError(f"Agent {i} is already matched to locality "
+                             f"{self.locality_per_agent[i]}.")
+        return self.move(i, l)
+
+    def remove(self, i):
+        """Unmatches agent i.
+
+        Returns:
+            the utility of the updated matching
+        """
+        return self.move(i, None)
+
+
+def _estimated_size(obj):
+    """Estimates the memory in bytes taken by ``obj`` and, for tuples and
+    frozensets, by its elements."""
+    size = getsizeof(obj)
+    if isinstance(obj, (tuple, frozenset)):
+        size += sum(_estimated_size(element) for element in obj)
+    return size
+
+
+class Memoization:
+    """Memoized partial utilities of a model, keyed by locality and a
+    model-specific key.
+
+    If ``max_entries`` or ``max_bytes`` is given, the least recently used
+    entries are evicted as soon as more entries are stored or their estimated
+    size (see ``_estimated_size``) exceeds the budget. Hits, misses and
+    evictions are counted per locality.
+
+    Attributes:
+        hits (list of int): for each locality, the number of successful
+                            lookups
+        misses (list of int): for each locality, the number of failed lookups
+        evictions (list of int): for each locality, the number of entries
+                                 evicted to stay within budget
+        num_bytes (int): estimated size of all entries
+    """
+
+    def __init__(self, num_localities, max_entries=None, max_bytes=None):
+        assert max_entries is None or max_entries >= 0
+        assert max_bytes is None or max_bytes >= 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = [0 for _ in range(num_localities)]
+        self.misses = [0 for _ in range(num_localities)]
+        self.evictions = [0 for _ in range(num_localities)]
+        self.num_bytes = 0
+        self._bounded = max_entries is not None or max_bytes is not None
+        # (l, key) → (value, estimated size)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def keys(self):
+        """Returns a view of the (locality, key) pairs memoized."""
+        return self._entries.keys()
+
+    def get(self, l, key):
+        """Returns the value memoized for ``key`` at locality l, or None."""
+        entry = self._entries.get((l, key))
+        if entry is None:
+            self.misses[l] += 1
+            return None
+        self.hits[l] += 1
+        if self._bounded:
+            self._entries.move_to_end((l, key))
+        return entry[0]
+
+    def put(self, l, key, value):
+        """Memoizes ``value`` for ``key`` at locality l, evicting the least
+        recently used entries if the budget is exceeded."""
+        full_key = (l, key)
+        previous = self._entries.pop(full_key, None)
+        if previous is not None:
+            self.num_bytes -= previous[1]
+        size = _estimated_size(full_key) + getsizeof(value)
+        self._entries[full_key] = (value, size)
+        self.num_bytes += size
+        while self._entries and (
+                (self.max_entries is not None
+                 and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None
+                    and self.num_bytes > self.max_bytes)):
+            (evicted_l, _), (_, evicted_size) = \
+                self._entries.popitem(last=False)
+            self.num_bytes -= evicted_size
+            self.evictions[evicted_l] += 1
+
+
+class RetroactiveCorrectionModel(Model):
+    """Model in which people randomly qualify for employment and that number
+    is corrected by a concave function."""
+
+    def __init__(self, num_agents, locality_caps, num_professions, professions,
+                 qualification_probabilities, correction_functions,
+                 random_samples, evaluation="sampling",
+                 memo_max_entries=None, memo_max_bytes=None, rng=None,
+                 common_random_numbers=False, tolerance=None,
+                 max_samples=None):
+        """Initializes the retroactive correction model.
+
+        Args:
+            num_agents (int): number of simulated agents, named i = 0, …,
+                              num_agents-1
+            locality_caps (list of int): for each locality l = 0, …,
+                                         len(locality_caps), its maximum
+                                         capacity
+            num_professions (int): number of different professions p = 0, …,
+                                   num_professions-1
+            professions (list of int): for each agent, their profession
+            qualification_probabilities (list of list of float):
+                    qualification_probabilities[i][l] is the probability of
+                    agent i qualifying for employment when in locality l
+            correction_functions (list of list of (int → float)):
+                    correction_functions[l][p] is the correction function for
+                    locality l and profession p
+            random_samples (int): number of random experiments to estimate
+                                  expected value
+            evaluation (str): "sampling" to estimate the expected corrected
+                              number of qualified agents by ``random_samples``
+                              experiments, "vectorized" to run these
+                              experiments as one NumPy batch, "exact" to
+                              compute it from the Poisson-binomial
+                              distribution of that number
+            memo_max_entries (int / None): maximum number of memoized partial
+                                           utilities, unbounded if None
+            memo_max_bytes (int / None): maximum estimated size in bytes of
+                                         the memoized partial utilities,
+                                         unbounded if None
+            rng (random.Random / numpy.random.Generator / None): generator
+                    of the random experiments, the global `random` module
+                    if None
+            common_random_numbers (bool): whether to fix, once and for all,
+                    whether agent i qualifies at locality l in the s-th
+                    random experiment, for "sampling" or "vectorized"
+                    evaluation; matchings that differ in a few agents are
+                    then evaluated on the same experiments, so that their
+                    difference in utility is estimated with much lower
+                    variance
+            tolerance (float / None): if given, each cell is estimated
+                    adaptively from batches of ``random_samples`` random
+                    experiments until the standard error of its estimate is
+                    at most ``tolerance`` or ``max_samples`` experiments are
+                    run, for "sampling" or "vectorized" evaluation, which
+                    then both run the experiments as NumPy batches. See
+                    ``utility_and_error_for_matching``
+            max_samples (int / None): maximum number of random experiments
+                                      per cell when sampling adaptively,
+                                      ``100 * random_samples`` if None
+        """
+        self.num_agents = num_agents
+        self.locality_caps = locality_caps
+        self.num_professions = num_professions
+        assert len(professions) == num_agents
+        self.professions = professions
+        assert len(qualification_probabilities) == num_agents
+        assert num_agents == 0 or (len(qualification_probabilities[0])
+                                   == len(locality_caps))
+        self.qualification_probabilities = qualification_probabilities
+        assert len(correction_functions) == len(locality_caps)
+        assert len(locality_caps) == 0 or (len(correction_functions[0])
+                                           == num_professions)
+        self.correction_functions = correction_functions
+        assert random_samples > 0
+        self.random_samples = random_samples
+        assert evaluation in ("sampling", "vectorized", "exact")
+        self.evaluation = evaluation
+        self._rng = python_rng(rng)
+        assert tolerance is None or tolerance >= 0
+        assert tolerance is None or (evaluation != "exact"
+                                     and not common_random_numbers)
+        self.tolerance = tolerance
+        self.max_samples = (100 * random_samples if max_samples is None
+                            else max_samples)
+        if evaluation == "vectorized" or tolerance is not None:
+            self._numpy_rng = numpy_rng(rng)
+        assert not common_random_numbers or evaluation != "exact"
+        self.common_random_numbers = common_random_numbers
+        if common_random_numbers:
+            # qualified[l][i, s] is whether agent i qualifies at locality l in
+            # the s-th random experiment
+            generator = numpy_rng(rng)
+            probabilities = np.array(qualification_probabilities,
+                                     dtype=float).reshape(num_agents,
+                                                          len(locality_caps))
+            self._qualified = [
+                generator.random((num_agents, random_samples))
+                < probabilities[:, l, None]
+                for l in range(len(locality_caps))]
+
+        self._memoization = Memoization(len(locality_caps), memo_max_entries,
+                                        memo_max_bytes)
+
+    def _utility_at_locality_profession(self, l, p, agents, memoize):
+        # The agent set identifies the cell's state; frozenset(agents) is a
+        # no-op for the frozensets of MatchingEvaluator, whose hash is cached
+        key = (p, frozenset(agents))
+        if self.tolerance is not None:
+            return self._estimate_at_locality_profession(l, p, agents,
+                                                         memoize)[0]
+        if memoize:
+            utility = self._memoization.get(l, key)
+            if utility is not None:
+                return utility
+
+        if self.common_random_numbers:
+            utility = self._common_utility(l, p, agents)
+            self._memoization.put(l, key, utility)
+            return utility
+
+        probs = tuple(sorted(self.qualification_probabilities[i][l]
+                             for i in agents))
+        if self.evaluation == "exact":
+            utility = self._exact_utility(l, p, probs)
+        elif self.evaluation == "vectorized":
+            utility = self._vectorized_utility(l, p, probs)
+        else:
+            random = self._rng.random
+            sum_utilities = 0
+            for _ in range(self.random_samples):
+                num_qualified = 0
+                for prob in probs:
+                    if random() < prob:
+                        num_qualified += 1
+                sum_utilities += self.correction_functions[l][p](num_qualified)
+            utility = sum_utilities / self.random_samples
+        self._memoization.put(l, key, utility)
+        return utility
+
+    def _estimate_at_locality_profession(self, l, p, agents, memoize):
+        probs = np.array([self.qualification_probabilities[i][l]
+                          for i in agents], dtype=float)
+        if not agents:
+            return (float(self.correction_functions[l][p](0)), 0.)
+        corrected = self._corrected_counts(l, p, len(probs))
+
+        def sample(num_samples):
+            return corrected[self._sampled_num_qualified(probs, num_samples)]
+
+        return self._adaptive_estimate(l, (p, frozenset(agents)), sample,
+                                       memoize)
+
+    def _sampled_num_qualified(self, probs, num_samples):
+        uniforms = self._numpy_rng.random((num_samples, len(probs)))
+        return (uniforms < np.array(probs)).sum(axis=1)
+
+    def _corrected_counts(self, l, p, num_agents):
+        """Returns the array of the corrected utilities of k = 0, …,
+        num_agents qualified agents in cell (l, p)."""
+        correction = self.correction_functions[l][p]
+        return np.array([correction(k) for k in range(num_agents + 1)],
+                        dtype=float)
+
+    def _mean_corrected_utility(self, l, p, num_qualified, num_agents):
+        # The correction function is only called once per possible number of
+        # qualified agents, and the samples are aggregated by a histogram
+        histogram = np.bincount(num_qualified, minlength=num_agents + 1)
+        return (float(histogram @ self._corrected_counts(l, p, num_agents))
+                / len(num_qualified))
+
+    def _vectorized_utility(self, l, p, probs):
+        num_qualified = self._sampled_num_qualified(probs,
+                                                    self.random_samples)
+        return self._mean_corrected_utility(l, p, num_qualified, len(probs))
+
+    def _common_utility(self, l, p, agents):
+        agents = list(agents)
+        num_qualified = self._qualified[l][agents].sum(axis=0)
+        return self._mean_corrected_utility(l, p, num_qualified, len(agents))
+
+    def _exact_utility(self, l, p, probs):
+        # distribution[k] is the probability that exactly k of the agents
+        # considered so far qualify (Poisson-binomial distribution)
+        distribution = [1.]
+        for prob in probs:
+            next_distribution = [0.] * (len(distribution) + 1)
+            for k, mass in enumerate(distribution):
+                next_distribution[k] += mass * (1 - prob)
+                next_distribution[k + 1] += mass * prob
+            distribution = next_distribution
+        correction = self.correction_functions[l][p]
+        return sum(mass * correction(k) for k, mass in enumerate(distribution))
+
+    def _cells(self):
+        for l in range(len(self.locality_caps)):
+            for p in range(self.num_professions):
+                yield (l, p)
+
+    def _cell(self, i, l):
+        return (l, self.professions[i])
+
+    def _utility_at_cell(self, cell, agents, memoize):
+        l, p = cell
+        return self._utility_at_locality_profession(l, p, agents, memoize)
+
+    def _estimate_at_cell(self, cell, agents, memoize):
+        l, p = cell
+        return self._estimate_at_locality_profession(l, p, agents, memoize)
+
+    def utility_for_matching(self, matching, memoize=True):
+        self.check_valid_matching(matching)
+
+        agents_per_locality_profession = [
+            [[] for _ in range(self.num_professions)]
+            for _ in self.locality_caps]
+        for i, l in enumerate(matching):
+            if l is not None:
+                p = self.professions[i]
+                agents_per_locality_profession[l][p].append(i)
+
+        utility = 0
+        for l in range(len(self.locality_caps)):
+            for p in range(self.num_professions):
+                utility += self._utility_at_locality_profession(
+                               l, p, agents_per_locality_profession[l][p],
+                               memoize)
+        return utility
+
+
+class InterviewModel(Model):
+    """Model in which agents apply for jobs in a random sequential order.
+    """
+
+    # Cells with more agents are evaluated by "conditional" instead of "exact"
+    # evaluation, whose cost grows like 2^(number of agents)
+    EXACT_MAX_AGENTS = 10
+
+    def __init__(self, num_agents, locality_caps, num_professions, professions,
+                 job_numbers, compatibility_probabilities, random_samples,
+                 memo_max_entries=None, memo_max_bytes=None,
+                 evaluation="sampling", rng=None,
+                 common_random_numbers=False, tolerance=None,
+                 max_samples=None):
+        """Initializes the interview model.
+
+        Args:
+            num_agents (int): number of simulated agents, named i = 0, …,
+                              num_agents-1
+            locality_caps (list of int): for each locality l = 0, …,
+                                         len(locality_caps), its maximum
+                                         capacity
+            num_professions (int): number of different professions p = 0, …,
+                                   num_professions-1
+            professions (list of int): for each agent, their profession
+            job_numbers(list of list of int): job_numbers[l][p] is the number
+                                              of available jobs at locality l
+                                              for profession p
+            compatibility_probabilities(list of float):
+                    for each agent, their probability p_i of getting a job of
+                    her profession
+            random_samples (int): number of random experiments to estimate
+                                  expected value
+            memo_max_entries (int / None): maximum number of memoized partial
+                                           utilities, unbounded if None
+            memo_max_bytes (int / None): maximum estimated size in bytes of
+                                         the memoized partial utilities,
+                                         unbounded if None
+            evaluation (str): "sampling" to simulate ``random_samples``
+                              interview processes; "vectorized" to simulate
+                              them as one NumPy batch; "conditional" to only
+                              sample the ``random_samples`` interview orders
+                              and compute the expected number of hires for
+                              each order exactly, which cannot have larger
+                              variance (Rao-Blackwellization); "exact" to
+                              average over all orders by dynamic programming
+                              over the set of agents interviewed so far, for
+                              cells of at most ``EXACT_MAX_AGENTS`` agents
+                              (larger cells use "conditional")
+            rng (random.Random / numpy.random.Generator / None): generator
+                    of the random experiments, the global `random` module
+                    if None
+            common_random_numbers (bool): whether to fix, once and for all,
+                    at which interview agent i first succeeds at locality l
+                    in the s-th random experiment and her position in its
+                    interview order, for "sampling" or "vectorized"
+                    evaluation; matchings that differ in a few agents are
+                    then evaluated on the same experiments, so that their
+                    difference in utility is estimated with much lower
+                    variance
+            tolerance (float / None): if given, each cell is estimated
+                    adaptively from batches of ``random_samples`` random
+                    experiments until the standard error of its estimate is
+                    at most ``tolerance`` or ``max_samples`` experiments are
+                    run, for "sampling" or "vectorized" evaluation, which
+                    then both run the experiments as NumPy batches. See
+                    ``utility_and_error_for_matching``
+            max_samples (int / None): maximum number of random experiments
+                                      per cell when sampling adaptively,
+                                      ``100 * random_samples`` if None
+        """
+        self.num_agents = num_agents
+        self.locality_caps = locality_caps
+        self.num_professions = num_professions
+        assert len(professions) == num_agents
+        self.professions = professions
+        assert len(job_numbers) == len(locality_caps)
+        assert len(job_numbers) == 0 or len(job_numbers[0]) == num_professions
+        self.job_numbers = job_numbers
+        assert len(compatibility_probabilities) == num_agents
+        self.compatibility_probabilities = compatibility_probabilities
+        assert random_samples > 0
+        self.random_samples = random_samples
+        assert evaluation in ("sampling", "vectorized", "conditional",
+                              "exact")
+        self.evaluation = evaluation
+        self._rng = python_rng(rng)
+        assert tolerance is None or tolerance >= 0
+        assert tolerance is None or (evaluation in ("sampling", "vectorized")
+                                     and not common_random_numbers)
+        self.tolerance = tolerance
+        self.max_samples = (100 * random_samples if max_samples is None
+                            else max_samples)
+        if evaluation == "vectorized" or tolerance is not None:
+            self._numpy_rng = numpy_rng(rng)
+        assert (not common_random_numbers
+                or evaluation in ("sampling", "vectorized"))
+        self.common_random_numbers = common_random_numbers
+        if common_random_numbers:
+            # attempts[l][i, s] is the interview at which agent i first
+            # succeeds at locality l in the s-th random experiment, capped
+            # above the number of jobs of her profession there; in each
+            # experiment, agents are interviewed by increasing priority
+            generator = numpy_rng(rng)
+            probs = np.array(compatibility_probabilities, dtype=float)
+            shape = (num_agents, random_samples)
+            self._attempts = []
+            self._priorities = []
+            for l in range(len(locality_caps)):
+                attempts = generator.geometric(
+                    np.where(probs > 0, probs, 1.)[:, None], size=shape)
+                cap = np.array([job_numbers[l][p] for p in professions],
+                               dtype=int) + 1
+                self._attempts.append(np.where(
+                    probs[:, None] > 0, np.minimum(attempts, cap[:, None]),
+                    cap[:, None]))
+                self._priorities.append(generator.random(shape))
+
+        self._memoization = Memoization(len(locality_caps), memo_max_entries,
+                                        memo_max_bytes)
+
+    def _utility_at_locality_profession(self, l, p, agents, memoize):
+        # The agent set identifies the cell's state; frozenset(agents) is a
+        # no-op for the frozensets of MatchingEvaluator, whose hash is cached
+        key = (p, frozenset(agents))
+        if self.tolerance is not None:
+            return self._estimate_at_locality_profession(l, p, agents,
+                                                         memoize)[0]
+        if memoize:
+            utility = self._memoization.get(l, key)
+            if utility is not None:
+                return utility
+
+        num_jobs = self.job_numbers[l][p]
+        if self.common_random_numbers:
+            utility = self._common_utility(l, agents, num_jobs)
+            self._memoization.put(l, key, utility)
+            return utility
+
+        probs = tuple(sorted(self.compatibility_probabilities[i]
+                             for i in agents))
+        if (self.evaluation == "exact"
+                and len(probs) <= self.EXACT_MAX_AGENTS):
+            utility = self._exact_utility(probs, num_jobs)
+        elif self.evaluation in ("exact", "conditional"):
+            utility = self._conditional_utility(probs, num_jobs)
+        elif self.evaluation == "vectorized":
+            utility = self._vectorized_utility(probs, num_jobs)
+        else:
+            random = self._rng.random
+            mutable_probs = list(probs)
+            sum_utilities = 0
+            for _ in range(self.random_samples):
+                num_jobs = self.job_numbers[l][p]
+                self._rng.shuffle(mutable_probs)
+                for prob in mutable_probs:
+                    for _ in range(num_jobs):
+                        if random() < prob:
+                            sum_utilities += 1
+                            num_jobs -= 1
+                            break
+            utility = sum_utilities / self.random_samples
+        self._memoization.put(l, key, utility)
+        return utility
+
+    def _estimate_at_locality_profession(self, l, p, agents, memoize):
+        if not agents:
+            return (0., 0.)
+        probs = [self.compatibility_probabilities[i] for i in agents]
+        num_jobs = self.job_numbers[l][p]
+
+        def sample(num_samples):
+            return num_jobs - self._sampled_jobs_left(probs, num_jobs,
+                                                      num_samples)
+
+        return self._adaptive_estimate(l, (p, frozenset(agents)), sample,
+                                       memoize)
+
+    def _vectorized_utility(self, probs, num_jobs):
+        if not probs:
+            return 0.
+        jobs_left = self._sampled_jobs_left(probs, num_jobs,
+                                            self.random_samples)
+        return float(num_jobs - jobs_left.mean())
+
+    def _sampled_jobs_left(self, probs, num_jobs, num_samples):
+        rng = self._numpy_rng
+        shape = (num_samples, len(probs))
+        probs = np.array(probs)
+        # An agent gets a job iff her first successful interview comes no
+        # later than the number of jobs left; agents who never succeed get
+        # more attempts than there are jobs
+        attempts = rng.geometric(np.where(probs > 0, probs, 1.), size=shape)
+        attempts[:, probs == 0] = num_jobs + 1
+        # Row-wise random permutations give the interview order per sample
+        order = rng.random(shape).argsort(axis=1)
+        attempts = np.take_along_axis(attempts, order, axis=1)
+        return self._deplete(attempts, num_jobs)
+
+    @staticmethod
+    def _deplete(attempts, num_jobs):
+        """Returns, for each sample, the number of jobs left after the
+        interviews.
+
+        Args:
+            attempts (numpy.ndarray): attempts[s, a] is the interview at
+                                      which the a-th interviewed agent of
+                                      sample s first succeeds
+            num_jobs (int): number of jobs at the start of each sample
+        """
+        jobs_left = np.full(attempts.shape[0], num_jobs)
+        for position in range(attempts.shape[1]):
+            jobs_left -= attempts[:, position] <= jobs_left
+        return jobs_left
+
+    def _common_utility(self, l, agents, num_jobs):
+        if not agents:
+            return 0.
+        agents = list(agents)
+        order = self._priorities[l][agents].argsort(axis=0)
+        attempts = np.take_along_axis(self._attempts[l][agents], order,
+                                      axis=0)
+        jobs_left = self._deplete(attempts.T, num_jobs)
+        return float(num_jobs - jobs_left.mean())
+
+    @staticmethod
+    def _hire_probabilities(probs, num_jobs):
+        # hire[a][h] is the probability that agent a gets a job when h of the
+        # num_jobs jobs are already taken, i.e., one of her num_jobs-h
+        # interviews succeeds
+        return [[1 - (1 - prob) ** (num_jobs - h) for h in range(num_jobs + 1)]
+                for prob in probs]
+
+    def _conditional_utility(self, probs, num_jobs):
+        hire = self._hire_probabilities(probs, num_jobs)
+        order = list(range(len(probs)))
+        sum_utilities = 0
+        for _ in range(self.random_samples):
+            self._rng.shuffle(order)
+            # distribution[h] is the probability that h jobs are taken
+            distribution = [1.] + [0.] * num_jobs
+            for a in order:
+                next_distribution = [0.] * (num_jobs + 1)
+                for h, mass in enumerate(distribution):
+                    hired = mass * hire[a][h]
+                    next_distribution[h] += mass - hired
+                    if hired:
+                        next_distribution[h + 1] += hired
+                distribution = next_distribution
+            sum_utilities += sum(h * mass
+                                 for h, mass in enumerate(distribution))
+        return sum_utilities / self.random_samples
+
+    def _exact_utility(self, probs, num_jobs):
+        hire = self._hire_probabilities(probs, num_jobs)
+        num_agents = len(probs)
+        # Maps each bitmask of the agents interviewed first to the joint
+        # probability of them coming first and h jobs being taken, for all h
+        distributions = {0: [1.] + [0.] * num_jobs}
+        for interviewed in range(num_agents):
+            # Each remaining agent is equally likely to come next
+            weight = 1 / (num_agents - interviewed)
+            next_distributions = {}
+            for subset, distribution in distributions.items():
+                for a in range(num_agents):
+                    if subset >> a & 1:
+                        continue
+                    target = next_distributions.get(subset | 1 << a)
+                    if target is None:
+                        target = [0.] * (num_jobs + 1)
+                        next_distributions[subset | 1 << a] = target
+                    for h, mass in enumerate(distribution):
+                        if not mass:
+                            continue
+                        mass *= weight
+                        hired = mass * hire[a][h]
+                        target[h] += mass - hired
+                        if hired:
+                            target[h + 1] += hired
+            distributions = next_distributions
+        distribution, = distributions.values()
+        return sum(h * mass for h, mass in enumerate(distribution))
+
+    def _cells(self):
+        for l in range(len(self.locality_caps)):
+            for p in range(self.num_professions):
+                yield (l, p)
+
+    def _cell(self, i, l):
+        return (l, self.professions[i])
+
+    def _utility_at_cell(self, cell, agents, memoize):
+        l, p = cell
+        return self._utility_at_locality_profession(l, p, agents, memoize)
+
+    def _estimate_at_cell(self, cell, agents, memoize):
+        l, p = cell
+        return self._estimate_at_locality_profession(l, p, agents, memoize)
+
+    def utility_for_matching(self, matching, memoize=True):
+        self.check_valid_matching(matching)
+
+        agents_per_locality_profession = [
+            [[] for _ in range(self.num_professions)]
+            for _ in self.locality_caps]
+        for i, l in enumerate(matching):
+            if l is not None:
+                p = self.professions[i]
+                agents_per_locality_profession[l][p].append(i)
+
+        utility = 0
+        for l in range(len(self.locality_caps)):
+            for p in range(self.num_professions):
+                utility += self._utility_at_locality_profession(
+                               l, p, agents_per_locality_profession[l][p],
+                               memoize)
+        return utility
+
+
+class BipartiteMatcher:
+    """Computes maximum matchings between ``num_left`` agents and
+    ``num_right`` jobs by augmenting paths, reusing its buffers for every
+    graph."""
+
+    def __init__(self, num_left, num_right):
+        self.num_left = num_left
+        self.num_right = num_right
+        self._match_of_left = [-1] * num_left
+        self._match_of_right = [-1] * num_right
+        self._visited = [0] * num_right
+        self._stamp = 0
+        self._adjacency = None
+
+    def maximum_matching_size(self, adjacency, warm_start=False):
+        """Returns the size of a maximum matching.
+
+        Args:
+            adjacency (list of list of int): for each agent u = 0, …,
+                                             num_left-1, the jobs she is
+                                             compatible with
+            warm_start (bool): whether to start from the maximum matching of
+                               the previous call, keeping its edges that are
+                               still present, instead of the empty matching
+        """
+        self._adjacency = adjacency
+        match_of_left = self._match_of_left
+        match_of_right = self._match_of_right
+        size = 0
+        if warm_start:
+            for u, j in enumerate(match_of_left):
+                if j < 0:
+                    continue
+                if j in adjacency[u]:
+                    size += 1
+                else:
+                    match_of_left[u] = -1
+                    match_of_right[j] = -1
+        else:
+            match_of_left[:] = [-1] * self.num_left
+            match_of_right[:] = [-1] * self.num_right
+        # Augmenting once from every free agent yields a maximum matching,
+        # whatever matching we start from
+        for u, edges in enumerate(adjacency):
+            if match_of_left[u] >= 0:
+                continue
+            for j in edges:
+                if match_of_right[j] < 0:
+                    match_of_right[j] = u
+                    match_of_left[u] = j
+                    size += 1
+                    break
+            else:
+                if edges:
+                    self._stamp += 1
+                    if self._augment(u):
+                        size += 1
+        return size
+
+    def _augment(self, u):
+        for j in self._adjacency[u]:
+            if self._visited[j] == self._stamp:
+                continue
+            self._visited[j] = self._stamp
+            if (self._match_of_right[j] < 0
+                    or self._augment(self._match_of_right[j])):
+                self._match_of_right[j] = u
+                self._match_of_left[u] = j
+                return True
+        return False
+
+
+class CoordinationModel(Model):
+    """Model that randomly determines compatibilities between agents and jobs,
+    then matches optimally.
+
+    More precisely, each locality has a certain number of jobs. Each agent and
+    each job have a certain probability of being compatible, and all these
+    decisions are independent. When all compatibilities in a locality are
+    determined, the utility at this locality is the cardinality of a maximum
+    matching in the induced bipartite graph between agents and jobs. The total
+    utility is the estimated expected value over possible compatibility
+    resolutions, summed up over all localities.
+    Note that the number of jobs and the cap do not have to coincide. It can be
+    reasonable to match more agents to a locality than the number of jobs if it
+    is likely that quite a few people cannot be matched. Similarly, a cap might
+    be smaller than the demands of the job market.
+    """
+
+    def __init__(self, num_agents, locality_caps, locality_num_jobs,
+                 compatibility_probabilities, random_samples,
+                 memo_max_entries=None, memo_max_bytes=None,
+                 evaluation="igraph", sparse_compatibilities=None,
+                 rng=None, common_random_numbers=False, tolerance=None,
+                 max_samples=None):
+        """Initializes the coordination model.
+
+        Args:
+            num_agents (int): number of simulated agents, named i = 0, …,
+                              num_agents-1
+            locality_caps (list of int): for each locality l = 0, …,
+                                         len(locality_caps), its maximum
+                                         capacity
+            locality_num_jobs (list of int): for each locality l, its number of
+                                             jobs j = 0, …,
+                                             locality_num_jobs[l]-1
+            compatibility_probabilities (list of list of list of float /
+                                         None):
+                    compatibility_probabilities[i][l][j] is the probability
+                    that agent i is compatible with job j at locality l; may
+                    be None if sparse_compatibilities is given
+            random_samples (int): number of random experiments to estimate
+                                  expected value
+            memo_max_entries (int / None): maximum number of memoized partial
+                                           utilities, unbounded if None
+            memo_max_bytes (int / None): maximum estimated size in bytes of
+                                         the memoized partial utilities,
+                                         unbounded if None
+            evaluation (str): how each sample's maximum matching is found;
+                              "igraph" builds an igraph graph over all agents,
+                              "augmenting" runs augmenting paths on reused
+                              adjacency lists of the agents at the locality,
+                              "warm_start" additionally starts each sample
+                              from the previous sample's matching, only
+                              repairing the edges that disappeared;
+                              "blocks" exploits localities where each agent
+                              has a single competency on one block of jobs
+                              (e.g., the jobs of her profession) and 0
+                              elsewhere, see ``_profession_blocks``, and uses
+                              "augmenting" at other localities
+            sparse_compatibilities (list of dict / None): the same
+                    probabilities in sparse form, see
+                    ``sparse_compatibilities``; built from
+                    compatibility_probabilities if None
+            rng (random.Random / numpy.random.Generator / None): generator
+                    of the random experiments, the global `random` module
+                    if None
+            common_random_numbers (bool): whether to fix, once and for all,
+                    which jobs agent i is compatible with at locality l in
+                    the s-th random experiment; matchings that differ in a
+                    few agents are then evaluated on the same experiments,
+                    so that their difference in utility is estimated with
+                    much lower variance. Each experiment's maximum matching
+                    is then found by augmenting paths, warm-started for
+                    "warm_start" evaluation
+            tolerance (float / None): if given, each locality is estimated
+                    adaptively from batches of ``random_samples`` random
+                    experiments until the standard error of its estimate is
+                    at most ``tolerance`` or ``max_samples`` experiments are
+                    run; their maximum matchings are found by augmenting
+                    paths, warm-started for "warm_start" evaluation. See
+                    ``utility_and_error_for_matching``
+            max_samples (int / None): maximum number of random experiments
+                                      per locality when sampling adaptively,
+                                      ``100 * random_samples`` if None
+
+        Only the sparse form is stored: for each locality l,
+        ``sparse_compatibilities[l]`` maps each agent i with at least one
+        compatible job at l to a pair (jobs, probabilities) of tuples listing,
+        in increasing order of j, the jobs j with positive probability and
+        these probabilities. Agents missing from the dict are compatible with
+        no job at l.
+        """
+        self.num_agents = num_agents
+        assert len(locality_caps) == len(locality_num_jobs)
+        self.locality_caps = locality_caps
+        self.locality_num_jobs = locality_num_jobs
+        if sparse_compatibilities is None:
+            assert len(compatibility_probabilities) == num_agents
+            assert num_agents == 0 or (len(compatibility_probabilities[0])
+                                       == len(locality_caps))
+            assert (num_agents == 0 or len(locality_caps) == 0
+                    or (len(compatibility_probabilities[0][0])
+                        == locality_num_jobs[0]))
+            sparse_compatibilities = self._sparsify(
+                compatibility_probabilities, len(locality_caps))
+        assert len(sparse_compatibilities) == len(locality_caps)
+        self.sparse_compatibilities = sparse_compatibilities
+        self._rng = python_rng(rng)
+        assert random_samples > 0
+        self.random_samples = random_samples
+        assert evaluation in ("igraph", "augmenting", "warm_start", "blocks")
+        self.evaluation = evaluation
+        if evaluation == "blocks":
+            self._blocks = [self._profession_blocks(l)
+                            for l in range(len(locality_caps))]
+        assert tolerance is None or tolerance >= 0
+        assert tolerance is None or not common_random_numbers
+        self.tolerance = tolerance
+        self.max_samples = (100 * random_samples if max_samples is None
+                            else max_samples)
+        self.common_random_numbers = common_random_numbers
+        if common_random_numbers:
+            # compatible[l][i][s, k] is whether agent i is compatible with
+            # her k-th candidate job at locality l in the s-th experiment
+            generator = numpy_rng(rng)
+            self._compatible = [
+                {i: (np.array(jobs),
+                     generator.random((random_samples, len(jobs)))
+                     < np.array(probabilities))
+                 for i, (jobs, probabilities) in compatibilities.items()}
+                for compatibilities in sparse_compatibilities]
+
+        self._memoization = Memoization(len(locality_caps), memo_max_entries,
+                                        memo_max_bytes)
+
+    @staticmethod
+    def _sparsify(compatibility_probabilities, num_localities):
+        """Converts dense compatibility probabilities to the sparse form."""
+        sparse = [{} for _ in range(num_localities)]
+        for i, agent_probabilities in enumerate(compatibility_probabilities):
+            for l, probabilities in enumerate(agent_probabilities):
+                jobs = tuple(j for j, probability in enumerate(probabilities)
+                             if probability != 0)
+                if jobs:
+                    sparse[l][i] = (jobs,
+                                    tuple(probabilities[j] for j in jobs))
+        return sparse
+
+    def _utility_at_locality(self, l, agents, memoize):
+        agents = frozenset(agents)
+        if self.tolerance is not None:
+            return self._estimate_at_locality(l, agents, memoize)[0]
+        if memoize:
+            utility = self._memoization.get(l, agents)
+            if utility is not None:
+                return utility
+
+        if self.common_random_numbers:
+            utility = self._common_utility(l, agents,
+                                           self.evaluation == "warm_start")
+            self._memoization.put(l, agents, utility)
+            return utility
+        if self.evaluation == "blocks" and self._blocks[l] is not None:
+            utility = self._block_decomposed_utility(l, agents, memoize)
+            self._memoization.put(l, agents, utility)
+            return utility
+        if self.evaluation in ("augmenting", "warm_start", "blocks"):
+            utility = self._augmenting_utility(
+                          l, agents, self.evaluation == "warm_start")
+            self._memoization.put(l, agents, utility)
+            return utility
+
+        random = self._rng.random
+        compatibilities = self.sparse_compatibilities[l]
+        sum_utilities = 0
+        for _ in range(self.random_samples):
+            num_jobs = self.locality_num_jobs[l]
+
+            # agent i has node id `i`, job j has node id `offset + j`
+            offset = self.num_agents
+            edges = []
+
+            for i in agents:
+                if i not in compatibilities:
+                    continue
+                # Only jobs with positive probability are stored, so random is
+                # never called for incompatible pairs
+                jobs, probabilities = compatibilities[i]
+                for j, probability in zip(jobs, probabilities):
+                    if random() < probability:
+                        edges.append((i, offset + j))
+
+            graph = Graph.Bipartite([0] * self.num_agents + [1] * num_jobs,
+                                    edges)
+            matching = graph.maximum_bipartite_matching()
+
+            sum_utilities += len(matching)
+        utility = sum_utilities / self.random_samples
+        self._memoization.put(l, agents, utility)
+        return utility
+
+    def _estimate_at_locality(self, l, agents, memoize):
+        agents = frozenset(agents)
+        if not agents:
+            return (0., 0.)
+        warm_start = self.evaluation == "warm_start"
+
+        def sample(num_samples):
+            return np.array(self._sampled_matching_sizes(l, agents,
+                                                         warm_start,
+                                                         num_samples),
+                            dtype=float)
+
+        return self._adaptive_estimate(l, agents, sample, memoize)
+
+    def _augmenting_utility(self, l, agents, warm_start):
+        return sum(self._sampled_matching_sizes(
+                       l, agents, warm_start, self.random_samples)
+                   ) / self.random_samples
+
+    def _sampled_matching_sizes(self, l, agents, warm_start, num_samples):
+        # Only jobs with positive compatibility probability are candidates
+        compatibilities = self.sparse_compatibilities[l]
+        candidates = [list(zip(*compatibilities[i])) if i in compatibilities
+                      else []
+                      for i in agents]
+        random = self._rng.random
+        matcher = BipartiteMatcher(len(candidates), self.locality_num_jobs[l])
+        adjacency = [[] for _ in candidates]
+        sizes = []
+        for _ in range(num_samples):
+            for edges, agent_candidates in zip(adjacency, candidates):
+                edges.clear()
+                for j, probability in agent_candidates:
+                    if random() < probability:
+                        edges.append(j)
+            sizes.append(matcher.maximum_matching_size(adjacency,
+                                                       warm_start))
+        return sizes
+
+    def _common_utility(self, l, agents, warm_start):
+        compatible = [self._compatible[l][i] for i in agents
+                      if i in self._compatible[l]]
+        matcher = BipartiteMatcher(len(compatible), self.locality_num_jobs[l])
+        adjacency = [None] * len(compatible)
+        sum_utilities = 0
+        for s in range(self.random_samples):
+            for a, (jobs, outcomes) in enumerate(compatible):
+                adjacency[a] = jobs[outcomes[s]].tolist()
+            sum_utilities += matcher.maximum_matching_size(adjacency,
+                                                           warm_start)
+        return sum_utilities / self.random_samples
+
+    def _profession_blocks(self, l):
+        """Detects whether locality l has block structure: every agent has
+        the same competency on all jobs of a set and probability 0 on the
+        others, and these sets of jobs are pairwise equal or disjoint.
+
+        Returns:
+            None if locality l has no block structure, else a pair
+            (block_sizes, agent_blocks). block_sizes[b] is the number of jobs
+            in block b and agent_blocks[i] is the pair (block, competency)
+            of agent i, or None if she is compatible with no job at l.
+        """
+        blocks = {}  # tuple of jobs → block index
+        used_jobs = set()
+        agent_blocks = []
+        compatibilities = self.sparse_compatibilities[l]
+        for i in range(self.num_agents):
+            if i not in compatibilities:
+                agent_blocks.append(None)
+                continue
+            jobs, probabilities = compatibilities[i]
+            competency = probabilities[0]
+            if any(probability != competency for probability in probabilities):
+                return None
+            if jobs not in blocks:
+                if not used_jobs.isdisjoint(jobs):
+                    return None
+                used_jobs.update(jobs)
+                blocks[jobs] = len(blocks)
+            agent_blocks.append((blocks[jobs], competency))
+        return [len(jobs) for jobs in blocks], agent_blocks
+
+    def _block_decomposed_utility(self, l, agents, memoize):
+        # Agents and jobs of different blocks are never compatible, so the
+        # maximum matching is the sum of the blocks' maximum matchings; each
+        # block is memoized on its own
+        block_sizes, agent_blocks = self._blocks[l]
+        agents_per_block = [[] for _ in block_sizes]
+        for i in agents:
+            if agent_blocks[i] is not None:
+                agents_per_block[agent_blocks[i][0]].append(i)
+
+        utility = 0
+        for b, block_agents in enumerate(agents_per_block):
+            if not block_agents:
+                continue
+            key = (b, frozenset(block_agents))
+            block_utility = None
+            if memoize:
+                block_utility = self._memoization.get(l, key)
+            if block_utility is None:
+                block_utility = self._block_utility(
+                                    block_sizes[b],
+                                    [agent_blocks[i][1] for i in block_agents])
+                self._memoization.put(l, key, block_utility)
+            utility += block_utility
+        return utility
+
+    def _block_utility(self, num_jobs, competencies):
+        """Expected maximum matching between agents and ``num_jobs`` jobs if
+        each agent is compatible with each job independently with her
+        competency."""
+        if num_jobs == 1:
+            # The job is filled iff some agent is compatible with it
+            probability_unfilled = 1.
+            for competency in competencies:
+                probability_unfilled *= 1 - competency
+            return 1 - probability_unfilled
+        if len(competencies) == 1:
+            return 1 - (1 - competencies[0]) ** num_jobs
+
+        random = self._rng.random
+        matcher = BipartiteMatcher(len(competencies), num_jobs)
+        adjacency = [[] for _ in competencies]
+        sum_utilities = 0
+        for _ in range(self.random_samples):
+            num_connected = 0
+            min_degree = num_jobs
+            for edges, competency in zip(adjacency, competencies):
+                edges.clear()
+                for j in range(num_jobs):
+                    if random() < competency:
+                        edges.append(j)
+                if edges:
+                    num_connected += 1
+                    min_degree = min(min_degree, len(edges))
+            if min_degree >= num_connected:
+                # Degree bound: each connected agent still has a free job
+                # after all others are matched, so all of them are matched
+                sum_utilities += num_connected
+            else:
+                sum_utilities += matcher.maximum_matching_size(adjacency)
+        return sum_utilities / self.random_samples
+
+    def _cells(self):
+        return range(len(self.locality_caps))
+
+    def _cell(self, i, l):
+        return l
+
+    def _utility_at_cell(self, cell, agents, memoize):
+        return self._utility_at_locality(cell, agents, memoize)
+
+    def _estimate_at_cell(self, cell, agents, memoize):
+        return self._estimate_at_locality(cell, agents, memoize)
+
+    def utility_for_matching(self, matching, memoize=True):
+        self.check_valid_matching(matching)
+
+        agents_per_locality = [[] for _ in self.locality_caps]
+        for i, l in enumerate(matching):
+            if l is not None:
+                agents_per_locality[l].append(i)
+
+        utility = 0
+        for l in range(len(self.locality_caps)):
+            utility += self._utility_at_locality(l, agents_per_locality[l],
+                                                 memoize)
+        return utility
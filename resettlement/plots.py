@@ -0,0 +1,103 @@
+def _format_y(ratio):
+    return f"{ratio-1:,.1%}"
+
+
+def _setup():
+    # Imported here so that simulating, e.g. in sweep workers, does not load
+    # the plotting stack
+    import matplotlib
+    matplotlib.use("Agg")
+    import seaborn
+    seaborn.set(style="darkgrid")
+    matplotlib.rcParams["figure.dpi"] = 300
+    matplotlib.rcParams["font.family"] = "serif"
+    matplotlib.rcParams["font.serif"] = ["Times New Roman"]
+    return matplotlib, seaborn
+
+
+def _catplot(experiment, data):
+    """Improvement of GSEMO over greedy against the first swept parameter,
+    with one column per value of the second one, if any."""
+    _, seaborn = _setup()
+    import pandas
+    d = pandas.DataFrame(data)
+    col = experiment.axes[1] if len(experiment.axes) > 1 else None
+    g = seaborn.catplot(x=experiment.axes[0], y="gsemo / greedy",
+                        hue="model", hue_order=list(experiment.settings),
+                        col=col, data=d)
+    for ax in g.axes.flat:
+        vals = ax.get_yticks()
+        ax.set_yticklabels([_format_y(x) for x in vals])
+        ax.set_ylabel("improvement of gsemo over greedy")
+    return g
+
+
+def _outliers(experiment, data):
+    """Improvement of GSEMO over greedy against the swept parameter, with one
+    column per model; ratios outside of the plotted range are annotated at
+    its border."""
+    matplotlib, seaborn = _setup()
+    import pandas
+    d = pandas.DataFrame(data)
+    x = experiment.axes[0]
+    y_min = 0.9
+    y_max = 1.2
+    g = seaborn.relplot(x=x, y="gsemo / greedy", col="model",
+                        col_order=list(experiment.settings), data=d,
+                        facet_kws={"ylim": (y_min, y_max)})
+    for i, setting in enumerate(experiment.settings):
+        up_outliers = {}
+        down_outliers = {}
+        for datum in data:
+            if datum["model"] != setting:
+                continue
+            ga = datum['gsemo / greedy']
+            nl = datum[x]
+            if ga is None:
+                continue
+            if ga > y_max:
+                if nl not in up_outliers:
+                    up_outliers[nl] = []
+                up_outliers[nl].append(ga)
+            if ga < y_min:
+                if nl not in down_outliers:
+                    down_outliers[nl] = []
+                down_outliers[nl].append(ga)
+        ax = g.axes[0][i]
+        ax.xaxis.set_major_locator(
+            matplotlib.ticker.MultipleLocator(5))
+        ax.yaxis.set_major_locator(
+            matplotlib.ticker.MultipleLocator(0.05))
+        vals = ax.get_yticks()
+        ax.set_yticklabels([_format_y(x) for x in vals])
+        ax.set_ylabel("improvement of gsemo over greedy")
+        for nl in up_outliers:
+            label = "\n".join(_format_y(ga) for ga in up_outliers[nl])
+            ax.annotate(label, xy=(nl, y_max),
+                        xytext=(nl, y_max-0.025),
+                        horizontalalignment="center",
+                        verticalalignment="top",
+                        arrowprops={"color": "b", "arrowstyle": "->"})
+        for nl in down_outliers:
+            label = "\n".join(_format_y(ga) for ga in down_outliers[nl])
+            ax.annotate(label, xy=(nl, y_min),
+                        xytext=(nl, y_min+0.025),
+                        horizontalalignment="center",
+                        verticalalignment="bottom",
+                        arrowprops={"color": "b", "arrowstyle": "->"})
+    return g
+
+
+_plots = {"catplot": _catplot, "outliers": _outliers}
+
+
+def plot(experiment, data, path):
+    """Plots the recorded data of an experiment.
+
+    Args:
+        experiment (experiments.Sweep): the experiment
+        data (list of dict): recorded data of its runs
+        path (str): path of the figure
+    """
+    g = _plots[experiment.plot](experiment, data)
+    g.savefig(path)
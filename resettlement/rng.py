@@ -0,0 +1,58 @@
+import random as random_module
+from random import Random
+
+import numpy as np
+
+
+def python_rng(rng):
+    """Returns a generator with the interface of `random.Random` drawing from
+    `rng`.
+
+    Args:
+        rng (random.Random / numpy.random.Generator / None): explicit
+                generator; None draws from the global `random` module, and
+                a NumPy generator seeds a new `random.Random`
+
+    Returns:
+        random.Random or the `random` module
+    """
+    if rng is None:
+        return random_module
+    if isinstance(rng, np.random.Generator):
+        return Random(int(rng.integers(2 ** 63)))
+    return rng
+
+
+def numpy_rng(rng):
+    """Returns a NumPy generator drawing from `rng`.
+
+    Args:
+        rng (random.Random / numpy.random.Generator / None): explicit
+                generator, returned as is if it is a NumPy generator; else a
+                new one is seeded from `python_rng(rng)`
+
+    Returns:
+        numpy.random.Generator
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(python_rng(rng).randrange(2 ** 32))
+
+
+def spawn_rngs(seed_, count):
+    """Derives independent streams from a seed.
+
+    The streams are spawned from a NumPy `SeedSequence`, so that they are
+    statistically independent and depend on nothing but `seed_` and their
+    index.
+
+    Args:
+        seed_ (int): seed of the parent stream
+        count (int): number of streams
+
+    Returns:
+        list of random.Random
+    """
+    children = np.random.SeedSequence(seed_).spawn(count)
+    return [Random(int(child.generate_state(1, np.uint64)[0]))
+            for child in children]
@@ -0,0 +1,159 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import os
+from random import Random
+
+
+def cell_seed(root_seed, repetition, cell):
+    """Derives the deterministic seed of one cell of a sweep.
+
+    The seed only depends on the root seed, the repetition and the cell's
+    arguments, so that a cell gives the same result whatever the number of
+    workers and the order in which cells are run.
+
+    Args:
+        root_seed (int): seed of the whole sweep
+        repetition (int): index of the repetition of the cell
+        cell (tuple): arguments passed to the sample function
+
+    Returns:
+        int: seed in 0, …, 2 ** 32 - 1
+    """
+    # Seeding with a string is deterministic across processes, unlike
+    # hash-based seeding with a tuple
+    return Random(repr((root_seed, repetition, cell))).randrange(2 ** 32)
+
+
+def _record_key(cell, seed_):
+    # Cells become lists when stored as JSON
+    return json.dumps([list(cell), seed_])
+
+
+def load_results(results_path):
+    """Loads the records of completed cells from a results file.
+
+    Args:
+        results_path (str): path of a JSONL file written by `run_sweep`
+
+    Returns:
+        list of dict: the records, each with keys "cell", "repetition",
+                      "seed" and "datum"; a missing file has no records and a
+                      trailing partial line left by a killed sweep is skipped
+    """
+    if not os.path.exists(results_path):
+        return []
+    records = []
+    with open(results_path) as results_file:
+        for line in results_file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def _append_result(results_file, cell, repetition, seed_, datum):
+    record = {"cell": list(cell), "repetition": repetition, "seed": seed_,
+              "datum": datum}
+    results_file.write(json.dumps(record) + "\n")
+    results_file.flush()
+    os.fsync(results_file.fileno())
+
+
+def _run_cell(sample, cell, seed_):
+    return sample(*cell, seed=seed_)
+
+
+def run_sweep(sample, cells, repetitions=1, root_seed=0, max_workers=None,
+              callback=None, results_path=None):
+    """Runs `sample(*cell, seed=...)` for each repetition and cell in a
+    process pool.
+
+    The seed of a run is `cell_seed(root_seed, repetition, cell)`. `sample`
+    must derive all its randomness from it, e.g., by passing generators
+    spawned with `rng.spawn_rngs` to the models and algorithms, so that
+    results are reproducible and do not depend on the global `random`
+    module.
+
+    If `results_path` is given, each completed run is appended to it as one
+    JSON line keyed by the cell's arguments and seed, and runs already
+    recorded there are not run again, so that a killed sweep can be resumed
+    by restarting it. Data must then be JSON-serializable.
+
+    `sample` must be picklable, i.e., defined at module level. Drivers using
+    the runner must guard their sweep with `if __name__ == "__main__":` so
+    that worker processes can import them.
+
+    Args:
+        sample (function): runs one cell with the given seed and returns its
+                           datum
+        cells (list of tuple): arguments of `sample` for each cell
+        repetitions (int): number of times each cell is run
+        root_seed (int): seed from which the seeds of all cells are derived
+        max_workers (int / None): number of worker processes, all cores if
+                                  None; if 1, cells are run in this process
+        callback (function / None): called in this process as
+                                    `callback(cell, datum)` whenever a cell
+                                    completes, in order of completion;
+                                    not called for runs loaded from
+                                    `results_path`
+        results_path (str / None): JSONL file recording completed runs,
+                                   nothing is recorded if None
+
+    Returns:
+        list: the datum of each cell, ordered by repetition and then by cell
+    """
+    jobs = [(cell, repetition, cell_seed(root_seed, repetition, cell))
+            for repetition in range(repetitions) for cell in cells]
+    results = [None] * len(jobs)
+
+    completed = {}
+    if results_path is not None:
+        for record in load_results(results_path):
+            key = _record_key(record["cell"], record["seed"])
+            completed[key] = record["datum"]
+    pending = []
+    for index, (cell, _, seed_) in enumerate(jobs):
+        key = _record_key(cell, seed_)
+        if key in completed:
+            results[index] = completed[key]
+        else:
+            pending.append(index)
+    if not pending:
+        return results
+
+    results_file = None
+    if results_path is not None:
+        results_file = open(results_path, "a")
+        if results_file.tell() > 0:
+            # Terminates a partial line left by a killed sweep
+            with open(results_path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    results_file.write("\n")
+
+    def finish(index, datum):
+        results[index] = datum
+        cell, repetition, seed_ = jobs[index]
+        if results_file is not None:
+            _append_result(results_file, cell, repetition, seed_, datum)
+        if callback is not None:
+            callback(cell, datum)
+
+    try:
+        if max_workers == 1:
+            for index in pending:
+                cell, _, seed_ = jobs[index]
+                finish(index, _run_cell(sample, cell, seed_))
+            return results
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_run_cell, sample, jobs[index][0],
+                                       jobs[index][2]): index
+                       for index in pending}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+        return results
+    finally:
+        if results_file is not None:
+            results_file.close()
@@ -0,0 +1,104 @@
+"""Checks that GSEMO's geometric-skip mutation flips bits like the per-bit
+loop it replaced, i.e., each bit independently with probability p.
+
+Run from the repository root with ``python -m pytest tests``.
+"""
+from math import factorial, sqrt
+
+import numpy as np
+
+from resettlement.methods import _mutate
+
+NUM_AGENTS = 20
+NUM_LOCALITIES = 5
+P = 1 / 20
+TRIALS = 20000
+# One-sided standard normal quantile of 0.999
+Z = 3.09
+
+
+def _per_bit_mutate(element, p, rng):
+    """The per-bit loop replaced by ``_mutate``."""
+    flips = rng.random(element.shape) < p
+    return element ^ flips.view(np.uint8)
+
+
+def _binomial_coefficient(n, k):
+    # math.comb needs Python 3.8
+    return factorial(n) // (factorial(k) * factorial(n - k))
+
+
+def _chi_square_quantile(df):
+    """Wilson-Hilferty approximation of the 0.999 quantile of the chi-square
+    distribution with ``df`` degrees of freedom."""
+    return df * (1 - 2 / (9 * df) + Z * sqrt(2 / (9 * df))) ** 3
+
+
+def _binomial_chi_square(flip_counts, n, p):
+    """Chi-square statistic of the flip counts against Binomial(n, p) and
+    its degrees of freedom, pooling the tail into bins of expected size at
+    least 5."""
+    histogram = np.bincount(flip_counts, minlength=n + 1)
+    expected = [_binomial_coefficient(n, k) * p ** k * (1 - p) ** (n - k)
+                * len(flip_counts)
+                for k in range(n + 1)]
+    bins = []  # pairs (observed, expected)
+    observed_pool = expected_pool = 0
+    for k in range(n + 1):
+        observed_pool += histogram[k]
+        expected_pool += expected[k]
+        if expected_pool >= 5 and sum(expected[k + 1:]) >= 5:
+            bins.append((observed_pool, expected_pool))
+            observed_pool = expected_pool = 0
+    bins.append((observed_pool, expected_pool))
+    statistic = sum((observed - expected) ** 2 / expected
+                    for observed, expected in bins)
+    return statistic, len(bins) - 1
+
+
+def _sample_flips(mutate, rng):
+    """Flip counts and per-position flip frequencies of ``TRIALS`` mutations
+    of a random genome."""
+    element = (rng.random((NUM_AGENTS, NUM_LOCALITIES)) < 0.3).astype(
+        np.uint8)
+    flip_counts = np.empty(TRIALS, dtype=int)
+    position_flips = np.zeros(element.shape, dtype=int)
+    for trial in range(TRIALS):
+        flipped = mutate(element, P, rng) ^ element
+        flip_counts[trial] = flipped.sum()
+        position_flips += flipped
+    return flip_counts, position_flips / TRIALS
+
+
+def test_flip_counts_are_binomial():
+    n = NUM_AGENTS * NUM_LOCALITIES
+    for mutate in (lambda element, p, rng: _mutate(element, p, rng)[0],
+                   _per_bit_mutate):
+        flip_counts, _ = _sample_flips(mutate, np.random.default_rng(0))
+        statistic, df = _binomial_chi_square(flip_counts, n, P)
+        assert statistic < _chi_square_quantile(df)
+
+
+def test_position_frequencies_match_per_bit_loop():
+    _, frequencies = _sample_flips(
+        lambda element, p, rng: _mutate(element, p, rng)[0],
+        np.random.default_rng(1))
+    _, reference = _sample_flips(_per_bit_mutate, np.random.default_rng(2))
+    standard_error = sqrt(P * (1 - P) / TRIALS)
+    # Bonferroni over the positions: |z| ≤ 4.5 for 100 positions keeps the
+    # false alarm rate below 0.1%
+    assert np.abs(frequencies - P).max() < 4.5 * standard_error
+    assert (np.abs(frequencies - reference).max()
+            < 4.5 * sqrt(2) * standard_error)
+
+
+def test_flips_list_the_changed_bits():
+    rng = np.random.default_rng(3)
+    element = (rng.random((NUM_AGENTS, NUM_LOCALITIES)) < 0.3).astype(
+        np.uint8)
+    for _ in range(1000):
+        offspring, flips = _mutate(element, P, rng)
+        changed = np.argwhere(offspring != element).tolist()
+        assert [[i, l] for i, l, _ in flips] == changed
+        for i, l, sign in flips:
+            assert sign == (1 if offspring[i, l] else -1)